@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Torn-read stress check for the shared status file's seqlock
+Writer processes publish (bridge_monitor.publish_status_file) a rotation of
+internally consistent states as fast as they can, while this process reads
+(bridge_status.read_status) in a tight loop. Every read must be one whole state,
+and generations must never go backwards. Exits 1 on a torn or out-of-order read.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import bridge_status  # noqa: E402
+
+# Each state sets every status field of both bridges to one value and the wind/gust to a matching speed
+STATES = {'OPEN': 10.0, 'RESTRICTED': 30.0, 'CLOSED': 50.0}
+
+
+def write(path, seconds, offset):
+    """Publish the STATES in turn for `seconds`; returns the number of writes"""
+    import bridge_monitor as bm
+    states = list(STATES.items())
+    writes = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        status, mph = states[(writes + offset) % len(states)]
+        bridge = {'status': status, 'eastbound': status, 'westbound': status}
+        reading = {'wind_speed_mph': mph, 'max_gust_mph': mph}
+        bm.publish_status_file(bridge, bridge, {'M48': reading, 'M4': reading}, [], path=path)
+        writes += 1
+    return writes
+
+
+def consistent(status):
+    """True if a read status is exactly one of the published STATES"""
+    values = {bridge[key] for bridge in status['bridges'].values() for key in ('status', 'eastbound', 'westbound')}
+    if len(values) != 1 or len(status['bridges']) != 2:
+        return False
+    mph = STATES.get(values.pop())
+    return all(bridge['wind_mph'] == mph and bridge['gust_mph'] == mph for bridge in status['bridges'].values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress the status file seqlock and look for torn reads")
+    parser.add_argument('--seconds', type=float, default=3.0, help="how long the writers run (default 3)")
+    parser.add_argument('--writers', type=int, default=2, help="concurrent writer processes (default 2)")
+    parser.add_argument('--writer', metavar='PATH', help=argparse.SUPPRESS)
+    parser.add_argument('--offset', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.writer:
+        print(write(args.writer, args.seconds, args.offset))
+        return 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'status.bin')
+        writers = [subprocess.Popen([sys.executable, os.path.abspath(__file__), '--writer', path,
+                                     '--seconds', str(args.seconds), '--offset', str(index)],
+                                    stdout=subprocess.PIPE, text=True)
+                   for index in range(args.writers)]
+        reads = torn = backwards = 0
+        last_generation = 0
+        while any(writer.poll() is None for writer in writers):
+            status = bridge_status.read_status(path)
+            if status is None:
+                continue
+            reads += 1
+            if not consistent(status):
+                torn += 1
+            if status['generation'] < last_generation or status['generation'] % 2:
+                backwards += 1
+            last_generation = status['generation']
+        writes = sum(int(writer.communicate()[0] or 0) for writer in writers)
+
+    print(f"{writes} writes by {args.writers} writers, {reads} reads: {torn} torn, {backwards} out of order")
+    return 1 if torn or backwards or not reads or not writes else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Brute-force check of bridge_monitor.ClosureTimeline
+Builds random Severn closures (shared boundaries, zero-length, inverted, undated and
+suspended windows included) and compares every timeline query with a scan over all
+closures, at the boundaries, just either side of them and at random times.
+Exits 1 on the first mismatch.
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import bridge_monitor as bm  # noqa: E402
+from generate_feed import SEVERN_LOCATIONS  # noqa: E402
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+SECOND = timedelta(seconds=1)
+
+
+def random_closures(rng, count):
+    """Closures at the crossings with hour-aligned windows, so many boundaries coincide"""
+    closures = []
+    for index in range(count):
+        road, location, direction, _, _ = rng.choice(SEVERN_LOCATIONS)
+        start = BASE + timedelta(hours=rng.randint(0, 200))
+        end = start + timedelta(hours=rng.choice([0, 1, 2, 5, 24, -3]))
+        stamp = lambda when: when.strftime('%Y-%m-%dT%H:%M:%SZ')
+        start_text, end_text = stamp(start), stamp(end)
+        if rng.random() < 0.05:
+            start_text = None
+        elif rng.random() < 0.05:
+            end_text = 'not a time'
+        status = rng.choice(['active', 'planned', 'planned', 'suspended'])
+        closures.append(bm.Closure(road, location, 'Carriageway closure', status, 'certain', 'roadworks',
+                                   start_text, end_text, None, direction, f"GUID{index}", '1'))
+    return closures
+
+
+def windows(closures):
+    """The closures the timeline should index, and the ones it should list as undated"""
+    indexed, undated = [], []
+    for closure in closures:
+        if not bm.is_severn_closure(closure) or closure.status == 'suspended':
+            continue
+        if closure.start_time and closure.end_time and closure.start_time <= closure.end_time:
+            indexed.append(closure)
+        else:
+            undated.append(closure)
+    return indexed, undated
+
+
+def ids(closures):
+    return sorted(id(closure) for closure in closures)
+
+
+def check(seed, count, queries):
+    """Compare one random timeline with brute force; returns a list of mismatch descriptions"""
+    rng = random.Random(seed)
+    closures = random_closures(rng, count)
+    timeline = bm.ClosureTimeline(closures)
+    indexed, undated = windows(closures)
+    errors = []
+
+    if ids(timeline.undated) != ids(undated):
+        errors.append("undated closures differ")
+
+    boundaries = sorted({c.start_time for c in indexed} | {c.end_time for c in indexed})
+    times = [BASE - timedelta(hours=1), BASE + timedelta(hours=300)]
+    for boundary in boundaries:
+        times += [boundary - SECOND, boundary, boundary + SECOND]
+    times += [BASE + timedelta(seconds=rng.randint(0, 210 * 3600)) for _ in range(queries)]
+
+    for when in times:
+        expected = [c for c in indexed if c.start_time <= when <= c.end_time]
+        if ids(timeline.active_at(when)) != ids(expected):
+            errors.append(f"active_at({when}) differs")
+
+        later = [b for b in boundaries if b > when]
+        got = timeline.next_change(when)
+        if not later:
+            if got is not None:
+                errors.append(f"next_change({when}) should be None")
+        else:
+            boundary = later[0]
+            expected = sorted([('start', id(c)) for c in indexed if c.start_time == boundary] +
+                              [('end', id(c)) for c in indexed if c.end_time == boundary])
+            if got is None or got[0] != boundary or sorted((k, id(c)) for k, c in got[1]) != expected:
+                errors.append(f"next_change({when}) differs")
+
+    for _ in range(queries):
+        start, end = sorted(rng.sample(times, 2))
+        events = timeline.changes_between(start, end)
+        expected = sorted([(c.start_time, 'start', id(c)) for c in indexed if start <= c.start_time <= end] +
+                          [(c.end_time, 'end', id(c)) for c in indexed if start <= c.end_time <= end])
+        if sorted((t, k, id(c)) for t, k, c in events) != expected:
+            errors.append(f"changes_between({start}, {end}) differs")
+        if [t for t, _, _ in events] != sorted(t for t, _, _ in events):
+            errors.append(f"changes_between({start}, {end}) is out of time order")
+        starting = timeline.starting_between(start, end)
+        if ids(starting) != ids(c for c in indexed if start <= c.start_time <= end):
+            errors.append(f"starting_between({start}, {end}) differs")
+        if ids(timeline.starting_between(start)) != ids(c for c in indexed if c.start_time >= start):
+            errors.append(f"starting_between({start}) differs")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check ClosureTimeline against brute force")
+    parser.add_argument('--seeds', type=int, default=50, help="random timelines to check (default 50)")
+    parser.add_argument('--closures', type=int, default=60, help="closures per timeline (default 60)")
+    parser.add_argument('--queries', type=int, default=200, help="random queries per timeline (default 200)")
+    args = parser.parse_args(argv)
+
+    for seed in range(args.seeds):
+        errors = check(seed, args.closures, args.queries)
+        if errors:
+            print(f"seed {seed}: {len(errors)} mismatches, e.g. {errors[0]}")
+            return 1
+    print(f"ClosureTimeline matches brute force on {args.seeds} timelines of {args.closures} closures")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
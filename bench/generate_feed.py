@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Synthetic feed generator for benchmarks
+Writes National Highways style closures XML (situation / sitRoadOrCarriagewayOrLaneManagement /
+posList, the shape bridge_monitor.parse_xml_stream expects) and a matching Open-Meteo JSON response,
+or a timestamped recording of both for bridge_monitor --replay
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from xml.sax.saxutils import escape
+
+# Roads for the non-Severn share of the feed
+OTHER_ROADS = ['M1', 'M3', 'M5', 'M6', 'M11', 'M18', 'M20', 'M25', 'M27', 'M40', 'M42', 'M50',
+               'M53', 'M56', 'M60', 'M62', 'A1(M)', 'A14', 'A30', 'A38']
+
+# (road, location, direction, centre lat, centre lon) for closures at the crossings
+SEVERN_LOCATIONS = [
+    ('M48', 'M48 westbound J1 to J2 Severn Bridge', 'westBound', 51.61, -2.64),
+    ('M48', 'M48 eastbound J2 to J1 Severn Bridge', 'eastBound', 51.61, -2.64),
+    ('M4', 'M4 westbound J21 to J23 Prince of Wales Bridge', 'westBound', 51.57, -2.70),
+    ('M4', 'M4 eastbound J23 to J22', 'eastBound', 51.57, -2.70),
+    ('M4', 'M4 J24 Newport, Wales', 'bothDirections', 51.58, -2.96),
+]
+
+STATUSES = ['active', 'planned', 'planned', 'planned', 'suspended']
+CAUSES = ['roadMaintenance', 'roadworks', 'poorEnvironment', 'accident', 'obstruction']
+COMMENTS = ['Carriageway closure {a}/{b}-{c}/{d}', 'Lane closure {a}/{b}', 'Hard shoulder closure {a}/{b}-{c}/{d}',
+            'Lane closures for resurfacing {a}/{b}', 'Carriageway closure due to high winds']
+MANAGEMENT_TYPES = ['carriagewayClosures', 'laneClosures', 'narrowLanes', 'hardShoulderClosed']
+# One weather point per crossing, in bridge_monitor.BRIDGES order (M48, M4)
+WEATHER_POINTS = ((51.61, -2.64), (51.57, -2.64))
+
+
+def _pos_list(rng, lat, lon, points):
+    """A short polyline of lat/lon pairs starting near (lat, lon)"""
+    coords = []
+    for _ in range(points):
+        coords.append(f"{lat:.5f} {lon:.5f}")
+        lat += rng.uniform(-0.004, 0.004)
+        lon += rng.uniform(-0.006, 0.006)
+    return ' '.join(coords)
+
+
+def _situation(rng, index, severn, now, version=None):
+    """One <situation> element as text"""
+    if severn:
+        road, location, direction, lat, lon = rng.choice(SEVERN_LOCATIONS)
+        lat += rng.uniform(-0.01, 0.01)
+        lon += rng.uniform(-0.01, 0.01)
+    else:
+        road = rng.choice(OTHER_ROADS)
+        junction = rng.randint(1, 40)
+        location = f"{road} J{junction} to J{junction + 1}"
+        direction = rng.choice(['northBound', 'southBound', 'eastBound', 'westBound', 'bothDirections'])
+        lat, lon = rng.uniform(50.2, 55.0), rng.uniform(-4.5, 1.2)
+    
+    start = now + timedelta(hours=rng.randint(-72, 24 * 14))
+    end = start + timedelta(hours=rng.randint(1, 24 * 5))
+    comment = rng.choice(COMMENTS).format(a=rng.randint(100, 250), b=rng.randint(0, 9),
+                                          c=rng.randint(100, 250), d=rng.randint(0, 9))
+    return (
+        f'<situation id="GUID{index:08d}" version="{version or rng.randint(1, 9)}">'
+        f'<situationRecord>'
+        f'<sitRoadOrCarriagewayOrLaneManagement id="REC{index:08d}">'
+        f'<validity><validityStatus>{rng.choice(STATUSES)}</validityStatus>'
+        f'<validityTimeSpecification>'
+        f'<overallStartTime>{start.strftime("%Y-%m-%dT%H:%M:%SZ")}</overallStartTime>'
+        f'<overallEndTime>{end.strftime("%Y-%m-%dT%H:%M:%SZ")}</overallEndTime>'
+        f'</validityTimeSpecification></validity>'
+        f'<probabilityOfOccurrence>{rng.choice(["certain", "probable", "riskOf"])}</probabilityOfOccurrence>'
+        f'<cause><causeType>{rng.choice(CAUSES)}</causeType></cause>'
+        f'<generalPublicComment><comment>{escape(comment)}</comment></generalPublicComment>'
+        f'<groupOfLocations>'
+        f'<locationDescription>{escape(location)}</locationDescription>'
+        f'<roadName>{road}</roadName>'
+        f'<directionOnLinearSection>{direction}</directionOnLinearSection>'
+        f'<posList>{_pos_list(rng, lat, lon, rng.randint(2, 12))}</posList>'
+        f'</groupOfLocations>'
+        f'<roadOrCarriagewayOrLaneManagementType><value>{rng.choice(MANAGEMENT_TYPES)}</value>'
+        f'</roadOrCarriagewayOrLaneManagementType>'
+        f'</sitRoadOrCarriagewayOrLaneManagement>'
+        f'</situationRecord>'
+        f'</situation>\n'
+    )
+
+
+def write_closures_xml(path, situations, severn_share=0.02, seed=0, now=None):
+    """Write a closures feed with `situations` situations, `severn_share` of them at the crossings"""
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write('<d2LogicalModel modelBaseVersion="2"><payloadPublication>\n')
+        f.write(f'<publicationTime>{now.strftime("%Y-%m-%dT%H:%M:%SZ")}</publicationTime>\n')
+        for index in range(situations):
+            f.write(_situation(rng, index, rng.random() < severn_share, now))
+        f.write('</payloadPublication></d2LogicalModel>\n')
+
+
+def _weather_response(rng, latitude, longitude, hours, now):
+    gust = 30.0
+    gusts = []
+    for _ in hours:
+        gust = min(max(gust + rng.uniform(-8, 8), 5.0), 110.0)  # km/h random walk
+        gusts.append(round(gust, 1))
+    return {
+        'latitude': latitude,
+        'longitude': longitude,
+        'timezone': 'Europe/London',
+        'current_weather': {'temperature': round(rng.uniform(-2, 24), 1),
+                            'windspeed': round(gusts[now.hour] * 0.6, 1),
+                            'time': now.strftime('%Y-%m-%dT%H:00')},
+        'utc_offset_seconds': int(now.astimezone().utcoffset().total_seconds()),
+        'hourly': {
+            'time': [hour.strftime('%Y-%m-%dT%H:%M') for hour in hours],
+            'precipitation_probability': [rng.randint(0, 100) for _ in hours],
+            'windgusts_10m': gusts,
+            'windspeed_10m': [round(gust * 0.6, 1) for gust in gusts],
+        },
+    }
+
+
+def write_weather_json(path, days=1, seed=0, now=None, points=WEATHER_POINTS):
+    """
+    Write an Open-Meteo forecast response with hourly gusts/wind/precipitation for `days` days
+    Several points give a list of per-point responses, as for a batched multi-point request.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    first_hour = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    hours = [first_hour + timedelta(hours=h) for h in range(24 * days)]
+    responses = [_weather_response(rng, latitude, longitude, hours, now) for latitude, longitude in points]
+    with open(path, 'w') as f:
+        json.dump(responses if len(responses) > 1 else responses[0], f)
+
+
+def write_recording(directory, snapshots, interval_minutes=5, situations=1000, severn_share=0.02,
+                    churn=0.01, seed=0, start=None):
+    """
+    Write a recording like a poller saving every response: closures-<UTC time>.xml every
+    interval_minutes and weather-<UTC time>.json every hour. Between snapshots a `churn`
+    share of situations gets a new version (and new content); the rest are unchanged.
+    """
+    rng = random.Random(seed)
+    start = start or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(
+        minutes=interval_minutes * snapshots)
+    severn = [rng.random() < severn_share for _ in range(situations)]
+    versions = [1] * situations
+    texts = [(None, '')] * situations  # index -> (version, <situation> text)
+    os.makedirs(directory, exist_ok=True)
+    for snapshot in range(snapshots):
+        when = start + timedelta(minutes=interval_minutes * snapshot)
+        for index in rng.sample(range(situations), int(situations * churn)):
+            versions[index] += 1
+        stamp = when.strftime('%Y%m%dT%H%M%SZ')
+        with open(os.path.join(directory, f'closures-{stamp}.xml'), 'w', encoding='utf-8') as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write('<d2LogicalModel modelBaseVersion="2"><payloadPublication>\n')
+            f.write(f'<publicationTime>{when.strftime("%Y-%m-%dT%H:%M:%SZ")}</publicationTime>\n')
+            for index in range(situations):
+                # Each situation version is generated once, from its own seed
+                if texts[index][0] != versions[index]:
+                    situation_rng = random.Random(f"{seed}:{index}:{versions[index]}")
+                    texts[index] = (versions[index], _situation(situation_rng, index, severn[index], start,
+                                                                versions[index]))
+                f.write(texts[index][1])
+            f.write('</payloadPublication></d2LogicalModel>\n')
+        if snapshot == 0 or when.minute < interval_minutes:
+            write_weather_json(os.path.join(directory, f'weather-{stamp}.json'), seed=seed + snapshot,
+                               now=when.astimezone())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic closures XML and Open-Meteo JSON")
+    parser.add_argument('--situations', type=int, default=1000, help="number of situations (default 1000)")
+    parser.add_argument('--severn-share', type=float, default=0.02,
+                        help="fraction of situations on M4/M48 at the crossings (default 0.02)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='closures.xml', help="closures XML path (default closures.xml)")
+    parser.add_argument('--weather-out', help="also write an Open-Meteo JSON response here")
+    parser.add_argument('--days', type=int, default=1, help="forecast days in the weather JSON (default 1)")
+    parser.add_argument('--recording', metavar='DIR',
+                        help="write a timestamped recording for --replay to DIR instead of one feed")
+    parser.add_argument('--snapshots', type=int, default=288, help="recording: closures snapshots (default 288)")
+    parser.add_argument('--interval', type=int, default=5, help="recording: minutes between snapshots (default 5)")
+    parser.add_argument('--churn', type=float, default=0.01,
+                        help="recording: share of situations changed per snapshot (default 0.01)")
+    args = parser.parse_args(argv)
+    
+    if args.recording:
+        write_recording(args.recording, args.snapshots, args.interval, args.situations, args.severn_share,
+                        args.churn, args.seed)
+        print(f"Wrote {args.snapshots} snapshots of {args.situations} situations to {args.recording}")
+        return
+
+    write_closures_xml(args.out, args.situations, args.severn_share, args.seed)
+    print(f"Wrote {args.situations} situations to {args.out}")
+    if args.weather_out:
+        write_weather_json(args.weather_out, args.days, args.seed)
+        print(f"Wrote {args.days} day(s) of weather to {args.weather_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Local stub receiver for bridge_monitor notifications
+Accepts webhook POSTs (any path) and, with --unix, JSON lines on a Unix socket, and prints each
+batch of events as it arrives. --delay and --fail make it a slow or failing subscriber, e.g.
+
+    python bench/notify_receiver.py --port 8767 --delay 20 &
+    python bridge_monitor.py --daemon --notify http://127.0.0.1:8767/hook
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def print_batch(source, body):
+    """Print one received notification body"""
+    try:
+        events = json.loads(body)['events']
+    except (ValueError, KeyError, TypeError):
+        print(f"{datetime.now():%H:%M:%S} {source}: unreadable body {body[:200]!r}", flush=True)
+        return
+    print(f"{datetime.now():%H:%M:%S} {source}: {len(events)} event(s)", flush=True)
+    for event in events:
+        print(f"    {event.get('text', event)}", flush=True)
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.server.received += 1
+        if self.server.received <= self.server.fail:
+            status = 500
+        else:
+            time.sleep(self.server.delay)
+            print_batch(f"POST {self.path}", body)
+            status = 204
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UnixHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            time.sleep(self.server.delay)
+            print_batch("unix socket", line)
+
+
+class UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print notifications sent by bridge_monitor --notify")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8767, help="webhook port (default 8767)")
+    parser.add_argument('--unix', metavar='PATH', help="also listen on this Unix socket (--notify unix:PATH)")
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds to wait before accepting each batch")
+    parser.add_argument('--fail', type=int, default=0, help="answer the first N webhook POSTs with 500")
+    args = parser.parse_args(argv)
+
+    webhook = ThreadingHTTPServer((args.host, args.port), WebhookHandler)
+    webhook.daemon_threads = True
+    webhook.received, webhook.fail, webhook.delay = 0, args.fail, args.delay
+    print(f"Webhook receiver on http://{args.host}:{args.port}/", flush=True)
+
+    if args.unix:
+        if os.path.exists(args.unix):
+            os.unlink(args.unix)
+        unix = UnixServer(args.unix, UnixHandler)
+        unix.delay = args.delay
+        threading.Thread(target=unix.serve_forever, daemon=True).start()
+        print(f"Unix socket receiver on {args.unix}", flush=True)
+    try:
+        webhook.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.unix:
+            os.unlink(args.unix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fetch / parse / classify / status pipeline against synthetic feeds
+Each feed size runs in its own process (so peak RSS is per run) against the local stub upstream,
+and results can be appended as JSON lines to track regressions across commits.
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from generate_feed import write_closures_xml, write_weather_json  # noqa: E402
+from stub_server import start_stub_server  # noqa: E402
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+
+def _peak_rss_kb():
+    """Peak resident set size of this process so far, in KiB (ru_maxrss is bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _timed(stages, name, func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    stages[name] = time.perf_counter() - started
+    return result
+
+
+def run_worker(closures_path, weather_path, situations):
+    """Measure every stage for one feed; runs in a fresh process and returns the result dict"""
+    server = start_stub_server(closures_path, weather_path)
+    work_dir = tempfile.mkdtemp(prefix='bridge-bench-')
+    os.environ['BRIDGE_CLOSURES_URL'] = server.base_url + '/closures'
+    os.environ['BRIDGE_WEATHER_URL'] = server.base_url + '/forecast'
+    os.environ['BRIDGE_CACHE_DIR'] = work_dir
+    os.environ['BRIDGE_API_KEY'] = 'benchmark'  # the stub doesn't check it
+    sys.path.insert(0, REPO_DIR)
+    import bridge_monitor as bm
+    
+    stages = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Streaming end to end first, so its peak RSS isn't masked by the buffered stages below
+        closures = _timed(stages, 'end_to_end_stream', bm.fetch_closures_stream, 0)
+        peak_stream_kb = _peak_rss_kb()
+        _timed(stages, 'revalidate_304', bm.fetch_closures_stream, 0)
+        _timed(stages, 'weather', bm.fetch_weather)
+        
+        def download():
+            status, chunks = bm.http_get(bm.BASE_URL)
+            return b''.join(chunks)
+        body = _timed(stages, 'fetch', download)
+        _timed(stages, 'hash', lambda: hashlib.new(bm.CLOSURES_DIGEST, body).hexdigest())
+        
+        view = memoryview(body)
+        chunks = [view[i:i + bm.XML_CHUNK_SIZE] for i in range(0, len(body), bm.XML_CHUNK_SIZE)]
+        bm._situations.clear()
+        closures = _timed(stages, 'parse_cold', bm.parse_xml_stream, chunks)
+        _timed(stages, 'parse_unchanged', bm.parse_xml_stream, chunks)
+        
+        bm._situations.clear()
+        closures = bm.parse_xml_stream(chunks)  # fresh records, so classification isn't cached yet
+        _timed(stages, 'classify', lambda: [bm.classify_closure(closure) for closure in closures])
+        _timed(stages, 'status', bm.get_bridge_current_status, closures)
+        _timed(stages, 'timeline', bm.ClosureTimeline, closures)
+    
+    server.shutdown()
+    return {
+        'situations': situations,
+        'bytes': len(body),
+        'kept': len(closures),
+        'severn': sum(1 for closure in closures if bm.is_severn_closure(closure)),
+        'stages': stages,
+        'situations_per_sec': situations / stages['parse_cold'] if stages['parse_cold'] else None,
+        'mb_per_sec': len(body) / 1e6 / stages['parse_cold'] if stages['parse_cold'] else None,
+        'peak_rss_stream_kb': peak_stream_kb,
+        'peak_rss_kb': _peak_rss_kb(),
+    }
+
+
+def ensure_feeds(data_dir, situations, severn_share, seed):
+    """Generate (or reuse) the closures XML and weather JSON for one size"""
+    os.makedirs(data_dir, exist_ok=True)
+    closures_path = os.path.join(data_dir, f"closures-{situations}-{severn_share}-{seed}.xml")
+    weather_path = os.path.join(data_dir, 'weather.json')
+    if not os.path.exists(closures_path):
+        print(f"Generating {situations} situations...", file=sys.stderr)
+        write_closures_xml(closures_path, situations, severn_share, seed)
+    write_weather_json(weather_path, days=1, seed=seed)  # cheap, and always matches the current points
+    return closures_path, weather_path
+
+
+def print_table(results):
+    stage_names = ['fetch', 'hash', 'parse_cold', 'parse_unchanged', 'classify', 'status',
+                   'end_to_end_stream', 'revalidate_304']
+    print(f"{'situations':>10} {'MB':>7} {'kept':>6} {'sit/s':>9} {'MB/s':>6} {'RSS MB':>7} "
+          + ' '.join(f"{name[:12]:>12}" for name in stage_names))
+    for result in results:
+        print(f"{result['situations']:>10} {result['bytes'] / 1e6:>7.1f} {result['kept']:>6} "
+              f"{result['situations_per_sec']:>9.0f} {result['mb_per_sec']:>6.1f} "
+              f"{result['peak_rss_kb'] / 1024:>7.1f} "
+              + ' '.join(f"{result['stages'][name] * 1000:>10.1f}ms" for name in stage_names))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark bridge_monitor's pipeline on synthetic feeds")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help=f"situations per feed (default {' '.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--severn-share', type=float, default=0.02,
+                        help="fraction of situations on M4/M48 at the crossings (default 0.02)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'bridge-bench-data'),
+                        help="where generated feeds are kept between runs")
+    parser.add_argument('--output', help="append one JSON line per run to this file")
+    parser.add_argument('--worker', nargs=3, metavar=('CLOSURES', 'WEATHER', 'SITUATIONS'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.worker:
+        closures_path, weather_path, situations = args.worker
+        print(json.dumps(run_worker(closures_path, weather_path, int(situations))))
+        return
+    
+    results = []
+    for situations in args.sizes:
+        closures_path, weather_path = ensure_feeds(args.data_dir, situations, args.severn_share, args.seed)
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker',
+                                 closures_path, weather_path, str(situations)],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        result.update(severn_share=args.severn_share, seed=args.seed,
+                      python=platform.python_version(), timestamp=time.strftime('%Y-%m-%dT%H:%M:%S'))
+        results.append(result)
+        if args.output:
+            with open(args.output, 'a') as f:
+                f.write(json.dumps(result) + '\n')
+    
+    print_table(results)
+
+
+if __name__ == "__main__":
+    main()
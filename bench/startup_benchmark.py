@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for bridge_monitor
+Times fresh interpreter launches (bytecode already compiled) for a bare import, a
+library call that needs no network, the CLI's --help and a read of the shared
+status file, against an empty interpreter, and lists which heavy modules a bare
+import pulls in.
+"""
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+SCRIPT = os.path.join(REPO_DIR, 'bridge_monitor.py')
+
+SCENARIOS = [
+    ('python (baseline)', ['-c', 'pass']),
+    ('import bridge_monitor', ['-c', 'import bridge_monitor']),
+    ('get_wind_risk_level', ['-c', 'from bridge_monitor import get_wind_risk_level; get_wind_risk_level(30)']),
+    ('bridge_monitor.py --help', [SCRIPT, '--help']),
+    ('bridge_status.read_status', ['-c', 'import bridge_status; bridge_status.read_status()']),
+]
+
+# Modules a bare import should not load (only the features that use them do)
+HEAVY_MODULES = ['ssl', 'http.client', 'http.server', 'socket', 'urllib.parse', 'xml.etree.ElementTree',
+                 'hashlib', 'sqlite3', 'pickle', 'tempfile', 'zlib', 'concurrent.futures', 'argparse', 'numpy']
+
+
+def time_launch(args, runs):
+    """Wall time in ms of `runs` fresh interpreter launches"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=REPO_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def loaded_heavy_modules():
+    """Heavy modules present in sys.modules after `import bridge_monitor`"""
+    check = f"import sys, bridge_monitor; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    return subprocess.run([sys.executable, '-c', check], cwd=REPO_DIR, check=True,
+                          capture_output=True, text=True).stdout.split()
+
+
+def import_profile(top):
+    """The `top` slowest modules (cumulative µs) under -X importtime for `import bridge_monitor`"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import bridge_monitor'],
+                            cwd=REPO_DIR, check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+            _, cumulative, name = line.split('|')
+            rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure bridge_monitor's cold-start and import cost")
+    parser.add_argument('--runs', type=int, default=20, help="launches per scenario (default 20)")
+    parser.add_argument('--importtime', type=int, metavar='N', default=0,
+                        help="also show the N slowest imports under -X importtime")
+    args = parser.parse_args(argv)
+
+    for path in (SCRIPT, os.path.join(REPO_DIR, 'bridge_status.py')):
+        compileall.compile_file(path, quiet=1)  # measure loading, not compiling
+
+    print(f"{'scenario':<28}{'min ms':>9}{'median ms':>11}")
+    for name, launch_args in SCENARIOS:
+        timings = time_launch(launch_args, args.runs)
+        print(f"{name:<28}{min(timings):>9.1f}{statistics.median(timings):>11.1f}")
+
+    heavy = loaded_heavy_modules()
+    print(f"\nHeavy modules loaded by a bare import: {', '.join(heavy) or 'none'}")
+
+    if args.importtime:
+        print(f"\n{'cumulative µs':>14}  module")
+        for cumulative, name in import_profile(args.importtime):
+            print(f"{cumulative:>14}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the National Highways and Open-Meteo APIs
+Serves a closures XML file on /closures and an Open-Meteo JSON file on /forecast (any query string),
+with ETag/If-None-Match, gzip and keep-alive like the real upstreams. Point bridge_monitor at it with
+BRIDGE_CLOSURES_URL / BRIDGE_WEATHER_URL.
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    def do_GET(self):
+        route = self.server.routes.get(self.path.split('?', 1)[0])
+        if route is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        path, content_type = route
+        body, gzipped, etag = self.server.load(path)
+        self.server.requests += 1
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        
+        use_gzip = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        payload = gzipped if use_gzip else body
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('ETag', etag)
+        if use_gzip:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Serves files from disk, re-reading (and re-compressing) them when they change"""
+    daemon_threads = True
+    
+    def __init__(self, address, closures_path, weather_path):
+        super().__init__(address, StubHandler)
+        self.routes = {'/closures': (closures_path, 'application/xml'),
+                       '/forecast': (weather_path, 'application/json')}
+        self.requests = 0
+        self._files = {}
+        self._lock = threading.Lock()
+    
+    def load(self, path):
+        """(body, gzipped body, ETag) for a file, cached until its mtime changes"""
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._files.get(path)
+            if cached is None or cached[0] != mtime:
+                with open(path, 'rb') as f:
+                    body = f.read()
+                cached = (mtime, body, gzip.compress(body, 6), '"' + hashlib.md5(body).hexdigest() + '"')
+                self._files[path] = cached
+            return cached[1:]
+    
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(closures_path, weather_path, host='127.0.0.1', port=0):
+    """Start the stub on a background thread (port 0 picks a free port); returns the server"""
+    server = StubServer((host, port), closures_path, weather_path)
+    threading.Thread(target=server.serve_forever, name='stub-upstream', daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve closures XML and Open-Meteo JSON like the real APIs")
+    parser.add_argument('closures', help="closures XML file (see generate_feed.py)")
+    parser.add_argument('weather', help="Open-Meteo JSON file")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+    
+    server = StubServer((args.host, args.port), args.closures, args.weather)
+    print(f"Stub upstream on {server.base_url}")
+    print(f"  BRIDGE_CLOSURES_URL={server.base_url}/closures")
+    print(f"  BRIDGE_WEATHER_URL={server.base_url}/forecast")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -2,28 +2,270 @@
 """
 Severn Bridge Monitor - Proof of Concept
 Queries the National Highways API for M4/M48 Severn Bridge status
+
+Importing the module has no side effects: configuration (API key, SSL context)
+is loaded on first use, and the networking, XML, hashing, storage and server
+modules are imported by the functions that need them, so library callers and
+short-lived CLI runs only pay for what they use. main() is the CLI.
 """
 
-import urllib.request
-import xml.etree.ElementTree as ET
-from datetime import datetime, timezone
-import ssl
-import hashlib
+from datetime import datetime, timedelta, timezone
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from contextlib import contextmanager, redirect_stdout
+from enum import Enum
 import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+
+# Run as a script, this module registers and names itself bridge_monitor before defining
+# anything, so what it pickles (disk cache records, replay tasks) refers to the importable
+# name and library users can load it too
+_RUN_AS_SCRIPT = __name__ == '__main__'
+if _RUN_AS_SCRIPT:
+    __name__ = 'bridge_monitor'
+    sys.modules.setdefault(__name__, sys.modules['__main__'])
+
+# Optional: only used to vectorise point-in-area checks on long geometries and
+# forecasts; imported on first use by _numpy(), None if not installed
+np = None
+_numpy_checked = False
+
+# API Configuration: the key comes from set_api_key(), $BRIDGE_API_KEY or
+# API_KEY_FILE, and is only read when the first closures request is made
+API_KEY_FILE = os.environ.get('BRIDGE_API_KEY_FILE', 'api_primary_key.txt')
+_api_key = os.environ.get('BRIDGE_API_KEY')
+# Both upstream URLs can be pointed at a local stand-in via the environment
+BASE_URL = os.environ.get('BRIDGE_CLOSURES_URL', "https://api.data.nationalhighways.co.uk/roads/v2.0/closures")
+# Open-Meteo forecast endpoint; the points (one per bridge, see BRIDGES) are added per request
+WEATHER_URL = os.environ.get('BRIDGE_WEATHER_URL', "https://api.open-meteo.com/v1/forecast")
+WEATHER_PARAMS = "hourly=precipitation_probability,windgusts_10m&timezone=Europe/London&forecast_days=1&current_weather=true"
+# Several days of hourly wind/gusts/rain for --forecast
+FORECAST_DAYS = 7
+FORECAST_PARAMS = f"hourly=precipitation_probability,windgusts_10m,windspeed_10m&timezone=GMT&forecast_days={FORECAST_DAYS}"
+
+# Monitored crossings and the point each one's weather is fetched for. All
+# points go into one batched Open-Meteo request; weather_ttl (seconds) may
+# override WEATHER_CACHE_DURATION per bridge.
+BRIDGES = {
+    'M48': {'name': "M48 Severn Bridge", 'latitude': 51.61, 'longitude': -2.64},
+    'M4': {'name': "M4 Prince of Wales Bridge", 'latitude': 51.57, 'longitude': -2.64},
+}
+
+# SSL context, created for the first HTTPS connection
+SSL_CONTEXT = None
+
+# HTTP layer: pooled keep-alive connections per (scheme, host) and
+# ETag/Last-Modified validators per URL for conditional GETs
+HTTP_TIMEOUT = 10
+HTTP_NOT_MODIFIED = 304
+_connections = {}  # (scheme, host) -> idle connections ready for another request
+_proxies = None  # scheme -> proxy URL from the environment, read on first connection
+_pool_lock = threading.Lock()
+_validators = {}
 
-# API Configuration
-API_KEY = open('api_primary_key.txt').read().strip()
-BASE_URL = "https://api.data.nationalhighways.co.uk/roads/v2.0/closures"
-# M48 Severn Bridge coordinates for weather
-WEATHER_URL = "https://api.open-meteo.com/v1/forecast?latitude=51.61&longitude=-2.64&hourly=precipitation_probability,windgusts_10m&timezone=Europe/London&forecast_days=1&current_weather=true"
+# Weather and closures are fetched concurrently under one overall deadline
+FETCH_DEADLINE = 15  # seconds
+_print_lock = threading.RLock()  # fetch, refresh and notifier threads print while the main thread renders
 
-# SSL context
-SSL_CONTEXT = ssl._create_unverified_context()
+# Resilience: network errors and 5xx answers are retried with jittered
+# exponential backoff, and a per-host circuit breaker stops requests to an
+# upstream that keeps failing (its state is kept on disk across runs)
+HTTP_RETRIES = 2               # extra attempts per request
+RETRY_BACKOFF_BASE = 0.5       # seconds; retry n waits random(0, base * 2**(n-1))
+RETRY_BACKOFF_MAX = 4
+CIRCUIT_FAILURE_THRESHOLD = 3  # consecutive failed requests that open a host's circuit
+CIRCUIT_OPEN_SECONDS = 60      # first cool-down; doubles with each failed trial request
+CIRCUIT_OPEN_MAX = 900
+_circuits = {}  # (scheme, host) -> {'failures': consecutive failures, 'open_until': time.time() or 0}
+_circuit_lock = threading.Lock()
+_circuits_restored = False
 
-# Simple caching
-_cache = {'hash': None, 'data': None}
-_weather_cache = {'timestamp': None, 'data': None}
+# Simple caching; 'hash' is the CLOSURES_DIGEST of the raw feed bytes the data was parsed from
+# (change detection only, so the fastest hashlib digest: SHA-1 has hardware support on most CPUs)
+CLOSURES_DIGEST = 'sha1'
+_cache = {'timestamp': None, 'hash': None, 'data': None}
+_cache_lock = threading.Lock()  # hash and data change together (background refreshes write them)
+_situations = {}  # situation id -> (version, its closures on corridor roads) from the last parse
+_timeline_cache = {'closures': None, 'timeline': None}
+_weather_cache = {}   # (latitude, longitude) -> {'timestamp', 'data'}, one entry per bridge
+_forecast_cache = {}  # same, for the multi-day forecast
 WEATHER_CACHE_DURATION = 1800  # 30 minutes in seconds
+CLOSURES_CACHE_DURATION = 60   # closures are served from cache without a request for this long
+# Past those ages a cached answer is still served at once for this much longer while a
+# background refresh runs; when a fetch fails, the last good answer is served at any age
+CLOSURES_STALE_WHILE_REVALIDATE = 900
+WEATHER_STALE_WHILE_REVALIDATE = 3600
+_refreshing = {}  # name -> thread of each background refresh in flight
+_refresh_lock = threading.Lock()
+
+# Daemon mode: poll interval adapts to how likely a status change is
+POLL_INTERVAL_FAST = 60        # wind at MONITOR/HIGH RISK, or a planned closure starts/ends soon
+POLL_INTERVAL_NORMAL = 300
+POLL_INTERVAL_RELAXED = 1800   # overnight with everything Safe and OPEN
+POLL_INTERVAL_MIN = 5          # never wake up more often than this
+CLOSURE_BOUNDARY_WINDOW = 1800  # seconds before a planned start/end that counts as "close"
+QUIET_HOURS = range(0, 6)      # local hours eligible for relaxed polling
+
+# Change events between polls, e.g. "M48 westbound went RESTRICTED→CLOSED"
+ChangeEvent = namedtuple('ChangeEvent', ['kind', 'road', 'direction', 'old', 'new', 'closure'])
+EVENT_STATUS_CHANGED = 'status_changed'    # road/direction status moved, e.g. RESTRICTED -> CLOSED
+EVENT_CLOSURE_ADDED = 'closure_added'      # closure is the new closure
+EVENT_CLOSURE_CHANGED = 'closure_changed'  # same situation, new version; old/new are the versions
+EVENT_CLOSURE_REMOVED = 'closure_removed'  # closure is the last seen version
+EVENT_WIND_RISK_CHANGED = 'wind_risk_changed'  # a bridge's wind or gusts crossed WIND_HIGH_RISK_MPH
+_previous_poll = {'situations': None, 'statuses': None, 'wind': None}
+_change_listeners = []
+
+# Notifications (--notify): status and wind risk changes are pushed to webhooks,
+# email or a Unix socket. Each subscriber has its own bounded queue and delivery
+# thread, so a slow one never holds up polling or the others; its events are
+# collected for a batch window and coalesced per road/direction, changes that
+# undo themselves (flapping) are dropped, and one road/direction is sent at most
+# once per cool-down.
+NOTIFY_EVENT_KINDS = (EVENT_STATUS_CHANGED, EVENT_WIND_RISK_CHANGED)
+NOTIFY_QUEUE_SIZE = 100         # changes waiting per subscriber; the oldest are dropped beyond this
+NOTIFY_BATCH_SECONDS = 120      # collect events this long before sending (two fast polls)
+NOTIFY_KEY_COOLDOWN = 600       # minimum seconds between sends for the same road/direction
+NOTIFY_TIMEOUT = 10
+NOTIFY_RETRIES = 2
+SMTP_HOST = os.environ.get('BRIDGE_SMTP_HOST', 'localhost')
+SMTP_PORT = int(os.environ.get('BRIDGE_SMTP_PORT', '25'))
+SMTP_FROM = os.environ.get('BRIDGE_SMTP_FROM', 'severn-bridge-monitor@localhost')
+_subscribers = []
+
+# Local status API (--serve): one pre-serialised snapshot shared by every client
+SERVE_DEFAULT_HOST = '127.0.0.1'
+_snapshot = {'body': None, 'etag': None, 'updated': None, 'expires': 0.0, 'as_of': None}
+_snapshot_lock = threading.Lock()
+
+# Persistent cache so separate CLI runs (cron, shell) share the caches above
+CACHE_DIR = os.environ.get('BRIDGE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'severn_bridge'))
+DISK_CACHE_VERSION = 8
+
+# Shared status file for prompts, status bars and cron checks: every run and daemon
+# poll publishes the bridges' status there in the fixed layout bridge_status.py reads
+# (seqlock-protected, read with mmap). An empty BRIDGE_STATUS_FILE turns it off.
+STATUS_FILE = os.environ.get('BRIDGE_STATUS_FILE', os.path.join(CACHE_DIR, 'status.bin'))
+
+# History archive (--archive FILE or BRIDGE_ARCHIVE): SQLite, one row per distinct
+# feed snapshot (by content hash), each closure version stored once and linked to
+# the snapshots it appeared in, plus one observation row (with each bridge's weather) per run
+ARCHIVE_FILE = os.environ.get('BRIDGE_ARCHIVE')
+ARCHIVE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    first_seen INTEGER NOT NULL,
+    last_seen INTEGER NOT NULL,
+    closure_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS closures (
+    id INTEGER PRIMARY KEY,
+    fingerprint TEXT NOT NULL UNIQUE,
+    situation_id TEXT,
+    version TEXT,
+    road TEXT NOT NULL,
+    direction TEXT,
+    status TEXT,
+    cause TEXT,
+    probability TEXT,
+    location TEXT,
+    description TEXT,
+    start_ts INTEGER,
+    end_ts INTEGER,
+    severn INTEGER NOT NULL,
+    bridge TEXT,
+    junction TEXT,
+    severity TEXT,
+    first_seen INTEGER NOT NULL,
+    latest INTEGER NOT NULL DEFAULT 1  -- 0 once a newer snapshot carries other versions of its situation
+);
+DROP INDEX IF EXISTS closures_situation;
+CREATE INDEX IF NOT EXISTS closures_situation_key ON closures (COALESCE(situation_id, fingerprint));
+CREATE INDEX IF NOT EXISTS closures_latest_road ON closures (road, severn, start_ts) WHERE latest = 1;
+CREATE INDEX IF NOT EXISTS closures_latest_cause ON closures (cause, road, severn, start_ts) WHERE latest = 1;
+DROP INDEX IF EXISTS closures_latest_month;
+CREATE INDEX IF NOT EXISTS closures_latest_end
+    ON closures (severn, end_ts, start_ts, road, direction, status) WHERE latest = 1;
+CREATE TABLE IF NOT EXISTS snapshot_closures (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    closure_id INTEGER NOT NULL REFERENCES closures (id),
+    PRIMARY KEY (snapshot_id, closure_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    observed_at INTEGER NOT NULL,
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id)
+);
+CREATE INDEX IF NOT EXISTS observations_time ON observations (observed_at);
+CREATE TABLE IF NOT EXISTS weather_readings (
+    observation_id INTEGER NOT NULL REFERENCES observations (id),
+    bridge TEXT NOT NULL,
+    temperature REAL,
+    wind_speed_mph REAL,
+    max_gust_mph REAL,
+    gust_time TEXT,
+    rain_probability INTEGER,
+    rain_time TEXT,
+    PRIMARY KEY (observation_id, bridge)
+) WITHOUT ROWID;
+'''
+# Listing severn explicitly either way keeps the (..., severn, start_ts) indexes usable
+_SEVERN_FILTER = {True: 'severn = 1', False: 'severn IN (0, 1)'}
+# After a new snapshot, only the versions it carries stay `latest` for its situations
+# (a closure without a situation id is keyed on its fingerprint, so it is its own situation)
+_ARCHIVE_MARK_LATEST = '''
+UPDATE closures SET latest = id IN (SELECT closure_id FROM snapshot_closures WHERE snapshot_id = :snapshot)
+WHERE COALESCE(situation_id, fingerprint) IN (
+    SELECT COALESCE(closures.situation_id, closures.fingerprint)
+    FROM snapshot_closures JOIN closures ON closures.id = closure_id
+    WHERE snapshot_id = :snapshot)
+'''
+
+# Streaming parser configuration
+XML_CHUNK_SIZE = 64 * 1024  # bytes read from the socket / fed to the pull parser per step
+CLOSURES_SPOOL_MEMORY = 4 * 1024 * 1024  # a downloaded feed larger than this is spooled to a temporary file
+RECORD_TAG = 'sitRoadOrCarriagewayOrLaneManagement'
+
+# Record element tag -> closure key, pulled in a single pass over each record
+RECORD_FIELDS = {
+    'roadName': 'road',
+    'locationDescription': 'location',
+    'comment': 'description',
+    'validityStatus': 'status',
+    'probabilityOfOccurrence': 'probability',
+    'causeType': 'cause',
+    'overallStartTime': 'start',
+    'overallEndTime': 'end',
+    'posList': 'coordinates',
+    'directionOnLinearSection': 'direction',
+}
+
+# Closure fields (in Closure constructor order) and their value when the element is missing
+CLOSURE_DEFAULTS = {
+    'road': "Unknown",
+    'location': "Unknown",
+    'description': "No description",
+    'status': "Unknown",
+    'probability': "unknown",
+    'cause': "unknown",
+    'start': None,
+    'end': None,
+    'coordinates': None,
+    'direction': "unknown",
+}
+
+# Wind risk thresholds (mph) for the Severn crossings
+WIND_MONITOR_MPH = 26    # possible restrictions
+WIND_HIGH_RISK_MPH = 41  # likely closure
+KMH_TO_MPH = 0.621371
+FORECAST_SMOOTHING_HOURS = 3  # calm gaps shorter than this don't split a predicted window
 
 # ANSI Color codes
 COLOR_GREEN = '\033[92m'
@@ -42,38 +284,713 @@ SEVERN_BRIDGE_AREA = {
     'lon_max': -2.55
 }
 
+# Classification rules (data, not code): location keywords per road that put a
+# closure at the Severn crossings, and description phrases that mean a full
+# closure. Matching is case-insensitive substring matching. Replace them with a
+# JSON file of the same shape via --rules or BRIDGE_RULES_FILE.
+CLASSIFICATION_RULES = {
+    'roads': {
+        # M48 Severn Bridge specific - Junction 1 and 2 only
+        'M48': ['j1', 'j2', 'junction 1', 'junction 2', 'severn'],
+        # M4 Prince of Wales Bridge: J21/J22 England side, J23/J24 Wales side,
+        # plus "Wales" or England/Wales border mentions
+        'M4': ['j21', 'j22', 'j23', 'j24', 'junction 21', 'junction 22', 'junction 23', 'junction 24',
+               'severn', 'wales', 'welsh border'],
+    },
+    'closed_phrases': ['carriageway closure'],
+}
+RULES_FILE = os.environ.get('BRIDGE_RULES_FILE')
+_rule_engine = None  # compiled from CLASSIFICATION_RULES on first use
+
+# Mile marker references like "201/5-196/0", stripped from descriptions
+_MILE_MARKER_RANGE = re.compile(r'\s*\d+/\d+-\d+/\d+\s*')
+_MILE_MARKER_END = re.compile(r'\s*\d+/\d+\s*$')
+_WHITESPACE = re.compile(r'\s+')
+_JUNCTION_KEYWORD = re.compile(r'^(?:j|junction\s*)(\d+)$')
 
-def fetch_weather():
-    """Fetch weather data from Open-Meteo API (no API key needed)"""
-    now = datetime.now(timezone.utc)
+# Registry of monitored areas (name -> bounding box). Every closure is matched
+# against all of them in one pass through a coarse grid index; add more
+# structures with register_area().
+MONITORED_AREAS = {
+    'severn': SEVERN_BRIDGE_AREA,
+    'avonmouth': {'lat_min': 51.47, 'lat_max': 51.51, 'lon_min': -2.72, 'lon_max': -2.66},
+    'thelwall': {'lat_min': 53.37, 'lat_max': 53.41, 'lon_min': -2.56, 'lon_max': -2.47},
+}
+AREA_GRID_SIZE = 0.1          # degrees per grid cell
+VECTORISE_MIN_POINTS = 32     # below this a plain loop beats building NumPy views
+_area_grid = None             # (lat cell, lon cell) -> area names; rebuilt lazily
+
+# Registry of monitored corridors. One download and one parse serve them all: the
+# parser keeps records on any corridor's road, and classify_closure() dispatches
+# each record by road name to the corridors watching that road. A closure is in a
+# corridor when its location matches one of the corridor's keywords for its road
+# or its geometry enters the corridor's area. 'roads' maps road -> location
+# keywords (None: the Severn rules, CLASSIFICATION_RULES['roads']); 'titles' names
+# each road's status (default: the corridor name); 'directions' are the feed's
+# directionOnLinearSection values reported separately. Add more with register_corridor().
+CORRIDORS = {
+    'severn': {'name': "Severn crossings", 'roads': None, 'area': 'severn',
+               'titles': {road: bridge['name'] for road, bridge in BRIDGES.items()},
+               'directions': ('eastBound', 'westBound')},
+    'avonmouth': {'name': "M5 Avonmouth Bridge", 'roads': {'M5': ['j18', 'j19', 'avonmouth']},
+                  'area': 'avonmouth', 'directions': ('northBound', 'southBound')},
+    'thelwall': {'name': "M6 Thelwall Viaduct", 'roads': {'M6': ['j20', 'j21', 'thelwall']},
+                 'area': 'thelwall', 'directions': ('northBound', 'southBound')},
+}
+_road_corridors = None  # road -> names of the corridors watching it; rebuilt lazily
+_corridor_cache = {'closures': None, 'corridors': None}
+
+# Replay/backtest (--replay DIR): recorded closures XML and Open-Meteo JSON files,
+# timestamped in their names, are re-run with the clock set to each recording's time
+REPLAY_BATCH_SIZE = 50  # consecutive snapshots per worker task, so the parse fingerprint cache stays warm
+_SITUATION_OPEN = re.compile(rb'<situation\s([^>]*?)/?>')
+_SITUATION_ID = re.compile(rb'\bid="([^"]*)"')
+_SITUATION_VERSION = re.compile(rb'\bversion="([^"]*)"')
+_RECORDING_TIMESTAMP = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})[T_ -]?(\d{2})[:-]?(\d{2})(?:[:-]?(\d{2}))?')
+
+# Instrumentation (--profile, --metrics FILE, /metrics): cumulative time per
+# pipeline stage and event counters. Fetch stages are per request; parse
+# includes the road filter, which happens inline as records are read.
+PROFILE_STAGES = ('fetch_dns', 'fetch_connect', 'fetch_tls', 'fetch_first_byte', 'fetch_body',
+                  'hash', 'parse', 'classify', 'status', 'render')
+_stage_stats = {}  # stage -> [calls, total seconds, max seconds]
+_counters = {}     # counter name -> count, e.g. 'closures_cache_hits', 'bytes_downloaded'
+_metrics_lock = threading.Lock()
+
+
+def _log(message):
+    """Print one line from any thread: a single write under _print_lock, so lines never interleave"""
+    with _print_lock:
+        print(f"{message}\n", end='')
+
+
+def _numpy():
+    """NumPy, imported on first call; None when it isn't installed"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+        _numpy_checked = True
+    return np
+
+def set_api_key(key=None, path=None):
+    """Use this National Highways API key, or read it from `path` on first use, instead of $BRIDGE_API_KEY"""
+    global _api_key, API_KEY_FILE
+    _api_key = key
+    if path is not None:
+        API_KEY_FILE = path
+
+def get_api_key():
+    """The National Highways API key, read from API_KEY_FILE on first use if not set otherwise"""
+    global _api_key
+    if _api_key is None:
+        with open(API_KEY_FILE) as f:
+            _api_key = f.read().strip()
+    return _api_key
+
+def _ssl_context():
+    global SSL_CONTEXT
+    if SSL_CONTEXT is None:
+        import ssl
+        SSL_CONTEXT = ssl._create_unverified_context()
+    return SSL_CONTEXT
+
+def record_stage(stage, seconds):
+    """Add one timed run of a pipeline stage to the metrics"""
+    with _metrics_lock:
+        stats = _stage_stats.get(stage)
+        if stats is None:
+            _stage_stats[stage] = [1, seconds, seconds]
+        else:
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+def count(name, amount=1):
+    """Increment a metrics counter"""
+    with _metrics_lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+@contextmanager
+def stage_timer(stage):
+    """Time the enclosed block as one run of a pipeline stage"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+def metrics_snapshot():
+    """Copy of the current metrics: {'stages': {stage: (calls, seconds, max)}, 'counters': {...}}"""
+    with _metrics_lock:
+        return {'stages': {stage: tuple(stats) for stage, stats in _stage_stats.items()},
+                'counters': dict(_counters)}
+
+def metrics_since(before):
+    """Metrics accumulated since an earlier metrics_snapshot() (max is over the whole process)"""
+    now = metrics_snapshot()
+    stages = {}
+    for stage, (calls, seconds, longest) in now['stages'].items():
+        prev_calls, prev_seconds, _ = before['stages'].get(stage, (0, 0.0, 0.0))
+        if calls > prev_calls:
+            stages[stage] = (calls - prev_calls, seconds - prev_seconds, longest)
+    counters = {name: value - before['counters'].get(name, 0) for name, value in now['counters'].items()
+                if value != before['counters'].get(name, 0)}
+    return {'stages': stages, 'counters': counters}
+
+def print_profile(metrics):
+    """Print a per-stage timing breakdown and the counters from metrics_since()"""
+    stages = metrics['stages']
+    total = sum(seconds for _, seconds, _ in stages.values()) or 1
+    print()
+    print("=" * 70)
+    print("⏱️  PROFILE")
+    print("=" * 70)
+    print(f"{'stage':<18}{'calls':>7}{'total ms':>11}{'max ms':>10}{'share':>8}")
+    for stage in sorted(stages, key=lambda s: PROFILE_STAGES.index(s) if s in PROFILE_STAGES else len(PROFILE_STAGES)):
+        calls, seconds, longest = stages[stage]
+        print(f"{stage:<18}{calls:>7}{seconds * 1000:>11.1f}{longest * 1000:>10.1f}{seconds / total:>8.0%}")
+    for name, value in sorted(metrics['counters'].items()):
+        print(f"{name:<30}{value:>12}")
+
+def write_metrics_line(path, metrics):
+    """Append metrics (from metrics_since) to a JSON lines file, one line per run/poll"""
+    line = {'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'stages': {stage: {'calls': calls, 'seconds': round(seconds, 6), 'max_seconds': round(longest, 6)}
+                       for stage, (calls, seconds, longest) in metrics['stages'].items()},
+            'counters': metrics['counters']}
+    try:
+        with open(path, 'a') as f:
+            f.write(json.dumps(line) + '\n')
+    except OSError as e:
+        print(f"✗ Could not write metrics: {e}")
+
+def format_prometheus():
+    """Cumulative metrics in the Prometheus text exposition format"""
+    metrics = metrics_snapshot()
+    lines = ['# HELP bridge_stage_seconds Time spent in each pipeline stage',
+             '# TYPE bridge_stage_seconds summary']
+    for stage, (calls, seconds, _) in sorted(metrics['stages'].items()):
+        lines.append(f'bridge_stage_seconds_sum{{stage="{stage}"}} {seconds:.6f}')
+        lines.append(f'bridge_stage_seconds_count{{stage="{stage}"}} {calls}')
+    lines += ['# HELP bridge_stage_seconds_max Longest single run of each pipeline stage',
+              '# TYPE bridge_stage_seconds_max gauge']
+    for stage, (_, _, longest) in sorted(metrics['stages'].items()):
+        lines.append(f'bridge_stage_seconds_max{{stage="{stage}"}} {longest:.6f}')
+    for name, value in sorted(metrics['counters'].items()):
+        lines.append(f'# TYPE bridge_{name}_total counter')
+        lines.append(f'bridge_{name}_total {value}')
+    return '\n'.join(lines) + '\n'
+
+def _proxy_for(scheme, netloc):
+    """
+    The (host, port, Proxy-Authorization header or None) of the proxy for a host,
+    from $HTTP_PROXY/$HTTPS_PROXY (and $NO_PROXY) as urllib reads them, or None
+    """
+    global _proxies
+    import urllib.request
+    from urllib.parse import urlsplit
+    if _proxies is None:
+        _proxies = urllib.request.getproxies()
+    proxy = _proxies.get(scheme)
+    if not proxy or urllib.request.proxy_bypass(urlsplit('//' + netloc).hostname):
+        return None
+    parts = urlsplit(proxy if '://' in proxy else 'http://' + proxy)
+    authorization = None
+    if parts.username:
+        import base64
+        from urllib.parse import unquote
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}".encode()
+        authorization = 'Basic ' + base64.b64encode(credentials).decode('ascii')
+    return parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80), authorization
+
+def _open_connection(key):
+    """
+    Open a connection for (scheme, host), timing DNS, TCP connect and TLS handshake separately
+    Through a proxy (see _proxy_for), DNS and connect are for the proxy. An https host is
+    reached through a CONNECT tunnel, set up within the connect stage, with TLS to the host
+    inside it; plain http requests go to the proxy itself as absolute URIs (see http_get).
+    """
+    import http.client
+    import socket
+    scheme, netloc = key
+    if scheme == 'https':
+        conn = http.client.HTTPSConnection(netloc, timeout=HTTP_TIMEOUT, context=_ssl_context())
+    else:
+        conn = http.client.HTTPConnection(netloc, timeout=HTTP_TIMEOUT)
+    proxy = _proxy_for(scheme, netloc)
+    host, port = (conn.host, conn.port) if proxy is None else proxy[:2]
+    with stage_timer('fetch_dns'):
+        addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    with stage_timer('fetch_connect'):
+        sock = _connect_any(addresses)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if proxy is not None and scheme == 'https':
+                _tunnel(sock, conn.host, conn.port, proxy[2])
+        except BaseException:
+            sock.close()
+            raise
+    if scheme == 'https':
+        try:
+            with stage_timer('fetch_tls'):
+                sock = _ssl_context().wrap_socket(sock, server_hostname=conn.host)
+        except BaseException:
+            sock.close()
+            raise
+    conn.sock = sock
+    count('connections_opened')
+    return conn
+
+def _tunnel(sock, host, port, authorization=None):
+    """Ask the HTTP proxy connected on sock for a CONNECT tunnel to host:port"""
+    import http.client
+    authority = f"[{host}]:{port}" if ':' in host else f"{host}:{port}"
+    request = f"CONNECT {authority} HTTP/1.1\r\nHost: {authority}\r\n"
+    if authorization:
+        request += f"Proxy-Authorization: {authorization}\r\n"
+    sock.sendall((request + "\r\n").encode('ascii'))
+    response = http.client.HTTPResponse(sock, method='CONNECT')
+    try:
+        response.begin()
+        if response.status != 200:
+            raise OSError(f"proxy refused CONNECT to {authority}: {response.status} {response.reason}")
+    finally:
+        response.close()
+
+def _connect_any(addresses):
+    """Connect to the first reachable getaddrinfo() result, trying each in turn as socket.create_connection does"""
+    import socket
+    error = OSError("getaddrinfo returned no addresses")
+    for family, socktype, proto, _, address in addresses:
+        sock = socket.socket(family, socktype, proto)
+        try:
+            sock.settimeout(HTTP_TIMEOUT)
+            sock.connect(address)
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+    raise error
+
+def _get_connection(key):
+    """Check out an idle pooled connection for (scheme, host), opening one if none is free"""
+    with _pool_lock:
+        idle = _connections.get(key)
+        if idle:
+            return idle.pop()
+    return _open_connection(key)
+
+def _release_connection(key, conn):
+    """Return a connection whose response has been fully read to the pool"""
+    with _pool_lock:
+        _connections.setdefault(key, []).append(conn)
+
+def _iter_body(key, conn, response):
+    """Yield the response body in decompressed chunks; the connection is pooled again once drained"""
+    import zlib
+    encoding = (response.getheader('Content-Encoding') or '').lower()
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == 'gzip' else None
+    drained = False
+    body_seconds = 0.0  # time spent reading/decompressing, not in the consumer between chunks
+    wire_bytes = 0
+    try:
+        while True:
+            started = time.perf_counter()
+            raw = response.read(XML_CHUNK_SIZE)
+            if not raw:
+                break
+            wire_bytes += len(raw)
+            chunk = decompressor.decompress(raw) if decompressor is not None else raw
+            body_seconds += time.perf_counter() - started
+            if chunk:
+                yield chunk
+        if decompressor is not None:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+        drained = True
+    finally:
+        record_stage('fetch_body', body_seconds)
+        count('bytes_downloaded', wire_bytes)
+        if drained:
+            _release_connection(key, conn)
+        else:
+            # Unread bytes are still on the socket, so it can't carry another request
+            conn.close()
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of making a request to a host whose circuit breaker is open"""
+
+def _restore_circuits():
+    """Load circuit breaker state saved by an earlier run, once per process"""
+    global _circuits_restored
+    with _circuit_lock:
+        if _circuits_restored:
+            return
+        _circuits_restored = True
+        entry = load_disk_cache('circuits')
+        if entry is not None:
+            _circuits.update(entry['circuits'])
+
+def _check_circuit(key):
+    """Raise CircuitOpenError while the host's circuit is open (after the cool-down, requests are let through again)"""
+    with _circuit_lock:
+        circuit = _circuits.get(key)
+        remaining = circuit['open_until'] - time.time() if circuit else 0
+    if remaining > 0:
+        count('circuit_rejections')
+        raise CircuitOpenError(f"{key[1]} is failing ({circuit['failures']} failed requests); "
+                               f"not retrying for another {remaining:.0f}s")
+
+def _record_outcome(key, ok):
+    """
+    Feed one request's outcome to the host's circuit breaker
+    CIRCUIT_FAILURE_THRESHOLD consecutive failures open the circuit for
+    CIRCUIT_OPEN_SECONDS; each further failure (a trial request after the
+    cool-down) doubles that, up to CIRCUIT_OPEN_MAX. A success closes it.
+    """
+    with _circuit_lock:
+        circuit = _circuits.setdefault(key, {'failures': 0, 'open_until': 0.0})
+        if ok and not circuit['failures']:
+            return  # the common case: nothing to change or save
+        if ok:
+            circuit['failures'] = 0
+            circuit['open_until'] = 0.0
+        else:
+            circuit['failures'] += 1
+            excess = circuit['failures'] - CIRCUIT_FAILURE_THRESHOLD
+            if excess >= 0:
+                cooldown = min(CIRCUIT_OPEN_SECONDS * 2 ** excess, CIRCUIT_OPEN_MAX)
+                circuit['open_until'] = time.time() + cooldown
+        failures = circuit['failures']
+        snapshot = {host: dict(state) for host, state in _circuits.items()}
+    if failures >= CIRCUIT_FAILURE_THRESHOLD:
+        count('circuit_opened')
+        _log(f"⚡ {key[1]} circuit open: {failures} failed requests, pausing requests for {cooldown}s")
+    # Saved so that separate runs (cron, shell prompts) share the failure count
+    save_disk_cache('circuits', {'circuits': snapshot})
+
+def _send_request(key, path, headers):
+    """Send a GET on a pooled connection and wait for the response headers; returns (conn, response)"""
+    import http.client
+    # An idle pooled connection may have been closed by the server; retry once on a fresh one
+    for attempt in (1, 2):
+        conn = _get_connection(key)
+        try:
+            with stage_timer('fetch_first_byte'):
+                conn.request('GET', path, headers=headers)
+                return conn, conn.getresponse()
+        except (ConnectionError, http.client.HTTPException):
+            conn.close()
+            if attempt == 2:
+                raise
+        except Exception:
+            conn.close()
+            raise
+
+def http_get(url, headers=None, conditional=False):
+    """
+    GET a URL over a pooled keep-alive connection, asking for gzip
     
-    # Check cache
-    if _weather_cache['timestamp'] is not None and _weather_cache['data'] is not None:
-        cache_age = (now - _weather_cache['timestamp']).total_seconds()
-        if cache_age < WEATHER_CACHE_DURATION:
-            print(f"Using cached weather data ({int(cache_age/60)} minutes old)")
-            return _weather_cache['data']
+    Validators (ETag/Last-Modified) from every 200 answer are remembered per URL
+    and sent back when conditional=True. Returns (status, chunks) where chunks iterates
+    the decompressed body; for anything but 200 the body is discarded and chunks
+    is empty, so a 304 costs only the header round trip.
+    
+    Network errors and 5xx answers are retried HTTP_RETRIES times with jittered
+    exponential backoff. Each host has a circuit breaker: while it is open,
+    CircuitOpenError is raised without touching the network.
+    """
+    import http.client
+    from urllib.parse import urlsplit
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
     
-    print("Fetching weather from Open-Meteo API...")
+    _restore_circuits()
+    _check_circuit(key)
+    
+    request_headers = {'Accept-Encoding': 'gzip'}
+    request_headers.update(headers or {})
+    proxy = _proxy_for(*key) if parts.scheme == 'http' else None
+    if proxy is not None:  # plain http is sent to the proxy as an absolute-URI request
+        path = f"http://{parts.netloc}{path}"
+        if proxy[2]:
+            request_headers['Proxy-Authorization'] = proxy[2]
+    if conditional:
+        etag, last_modified = _validators.get(url, (None, None))
+        if etag:
+            request_headers['If-None-Match'] = etag
+        if last_modified:
+            request_headers['If-Modified-Since'] = last_modified
+    
+    for attempt in range(HTTP_RETRIES + 1):
+        if attempt:
+            import random
+            # "Full jitter": a random wait up to the exponential bound spreads out retrying clients
+            time.sleep(random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1))))
+            count('http_retries')
+        try:
+            conn, response = _send_request(key, path, request_headers)
+        except (OSError, http.client.HTTPException) as e:
+            error = e
+            continue
+        if response.status < 500:
+            break
+        response.read()
+        _release_connection(key, conn)
+        error = None
+    else:
+        _record_outcome(key, False)
+        if error is not None:
+            raise error
+        return response.status, iter(())
+    _record_outcome(key, True)
     
+    if response.status != 200:
+        response.read()
+        _release_connection(key, conn)
+        return response.status, iter(())
+    
+    _validators[url] = (response.getheader('ETag'), response.getheader('Last-Modified'))
+    return response.status, _iter_body(key, conn, response)
+
+def load_disk_cache(name):
+    """Load a cache entry written by save_disk_cache, or None if missing/unreadable/outdated"""
+    import pickle
     try:
-        req = urllib.request.Request(WEATHER_URL)
-        with urllib.request.urlopen(req, timeout=10, context=SSL_CONTEXT) as response:
-            if response.status == 200:
-                print(f"✓ Weather API call successful")
-                data = json.loads(response.read().decode('utf-8'))
-                
-                # Cache the result
-                _weather_cache['timestamp'] = now
-                _weather_cache['data'] = data
-                
-                return data
-            else:
-                print(f"✗ Weather API call failed (Status: {response.status})")
-                return None
+        with open(os.path.join(CACHE_DIR, name + '.pickle'), 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(entry, dict) or entry.get('version') != DISK_CACHE_VERSION:
+        return None
+    return entry
+
+def save_disk_cache(name, entry):
+    """Atomically write a cache entry (temp file + rename, so readers never see a partial file)"""
+    import pickle
+    import tempfile
+    entry = dict(entry, version=DISK_CACHE_VERSION)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=name, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, os.path.join(CACHE_DIR, name + '.pickle'))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        _log(f"✗ Could not write {name} cache: {e}")
+
+def _restore_weather_cache():
+    """Seed the in-memory weather cache and validators from disk (first call in a process)"""
+    entry = load_disk_cache('weather')
+    if entry is not None:
+        _weather_cache.update(entry['locations'])
+        _validators.update(entry['validators'])
+
+def _persist_weather_cache():
+    save_disk_cache('weather', {
+        'locations': _weather_cache,
+        'validators': {url: validators for url, validators in _validators.items() if url.startswith(WEATHER_URL)},
+    })
+
+def _restore_closures_cache():
+    """Seed the in-memory closures cache and validators from disk (first call in a process)"""
+    entry = load_disk_cache('closures')
+    # Unchanged situations are reused without re-reading, so a cache parsed for other roads can't be
+    if entry is not None and entry['roads'] == sorted(corridor_roads()):
+        _set_closures_cache(entry['timestamp'], entry['hash'], entry['data'])
+        _situations.update(entry['situations'])
+        _validators[BASE_URL] = entry['validators']
+
+def _set_closures_cache(timestamp, data_hash, data):
+    with _cache_lock:
+        _cache.update(timestamp=timestamp, hash=data_hash, data=data)
+
+def _cached_closures():
+    """(closures, content hash) of the cache, read together"""
+    with _cache_lock:
+        return _cache['data'], _cache['hash']
+
+def _persist_closures_cache():
+    with _cache_lock:
+        cached = dict(_cache)
+    save_disk_cache('closures', {
+        'timestamp': cached['timestamp'],
+        'hash': cached['hash'],
+        'data': cached['data'],
+        'situations': _situations,
+        'roads': sorted(corridor_roads()),
+        'validators': _validators.get(BASE_URL, (None, None)),
+    })
+
+def refresh_in_background(name, refresh):
+    """
+    Run refresh() on its own thread unless a refresh called name is already running
+    The thread is not a daemon, so a one-shot run still finishes (and saves) the
+    refresh after printing its answer. Returns the thread, or None if one was running.
+    """
+    def run():
+        try:
+            refresh()
+        except Exception as e:
+            _log(f"✗ Background {name} refresh failed: {e}")
+        finally:
+            with _refresh_lock:
+                _refreshing.pop(name, None)
+    
+    with _refresh_lock:
+        if name in _refreshing:
+            return None
+        thread = _refreshing[name] = threading.Thread(target=run, name=f'refresh-{name}')
+    thread.start()
+    return thread
+
+def wait_for_refreshes():
+    """Wait for the background refreshes in flight (e.g. before sys.stdout is restored)"""
+    with _refresh_lock:
+        threads = list(_refreshing.values())
+    for thread in threads:
+        thread.join()
+
+def _format_age(seconds):
+    """'45 seconds', '12 minutes', '3.5 hours'"""
+    if seconds < 120:
+        return f"{int(seconds)} seconds"
+    if seconds < 2 * 3600:
+        return f"{int(seconds / 60)} minutes"
+    return f"{seconds / 3600:.1f} hours"
+
+def weather_url(points, params):
+    """Open-Meteo URL asking for several (latitude, longitude) points in one request"""
+    separator = '&' if '?' in WEATHER_URL else '?'
+    latitudes = ','.join(f"{latitude:g}" for latitude, _ in points)
+    longitudes = ','.join(f"{longitude:g}" for _, longitude in points)
+    return f"{WEATHER_URL}{separator}latitude={latitudes}&longitude={longitudes}&{params}"
+
+def _download_weather_points(cache, points, params, label, counter):
+    """
+    Fetch Open-Meteo data for several (latitude, longitude) points in one request and store it in cache
+    Open-Meteo answers a multi-point request with a list of per-point responses in request order.
+    Returns: dict point -> data, or None if the request failed
+    """
+    now = datetime.now(timezone.utc)
+    _log(f"Fetching {label} from Open-Meteo API...")
+    try:
+        status, chunks = http_get(weather_url(points, params), {'Accept': 'application/json'},
+                                  conditional=all(point in cache for point in points))
+        if status == HTTP_NOT_MODIFIED:
+            _log(f"✓ {label.capitalize()} not modified since last fetch")
+            count(f'{counter}_not_modified', len(points))
+            responses = [cache[point]['data'] for point in points]
+        elif status == 200:
+            _log(f"✓ {label.capitalize()} API call successful")
+            count(f'{counter}_cache_misses', len(points))
+            responses = json.loads(b''.join(chunks).decode('utf-8'))
+            if isinstance(responses, dict):
+                responses = [responses]
+            if len(responses) != len(points):
+                raise ValueError(f"expected {len(points)} locations, got {len(responses)}")
+        else:
+            _log(f"✗ {label.capitalize()} API call failed (Status: {status})")
+            return None
     except Exception as e:
-        print(f"✗ Weather API call failed: {e}")
+        _log(f"✗ {label.capitalize()} API call failed: {e}")
         return None
+    
+    for point, data in zip(points, responses):
+        cache[point] = {'timestamp': now, 'data': data}
+    return dict(zip(points, responses))
+
+def _fetch_weather_points(cache, params, label, counter, stale_while_revalidate=0, persist=None):
+    """
+    Fetch Open-Meteo data for every bridge's point, one batched request for all
+    points whose cache entry has outlived its TTL
+    
+    cache maps (latitude, longitude) -> {'timestamp', 'data'}. Entries less than
+    stale_while_revalidate seconds past their TTL are served as they are while a
+    background request refreshes them (then calls persist()). If the request fails,
+    cached entries of any age are served instead.
+    Returns: (dict bridge -> data, True if the cache changed); bridges with no data at all are missing
+    """
+    now = datetime.now(timezone.utc)
+    result = {}
+    stale = {}  # point -> bridges at it
+    revalidate = []  # points served from cache but due a refresh
+    oldest = 0
+    for road, bridge in BRIDGES.items():
+        point = (bridge['latitude'], bridge['longitude'])
+        entry = cache.get(point)
+        cache_age = (now - entry['timestamp']).total_seconds() if entry else None
+        ttl = bridge.get('weather_ttl', WEATHER_CACHE_DURATION)
+        if cache_age is not None and cache_age < ttl + stale_while_revalidate:
+            result[road] = entry['data']
+            oldest = max(oldest, cache_age)
+            if cache_age >= ttl and point not in revalidate:
+                revalidate.append(point)
+        else:
+            stale.setdefault(point, []).append(road)
+    count(f'{counter}_cache_hits', len(result))
+    
+    if not stale:
+        if not revalidate:
+            _log(f"Using cached {label} data ({int(oldest/60)} minutes old)")
+            return result, False
+        _log(f"Using cached {label} data ({_format_age(oldest)} old), refreshing in the background")
+        count(f'{counter}_stale_served', len(revalidate))
+        
+        def refresh():
+            if _download_weather_points(cache, revalidate, params, label, counter) is not None and persist:
+                persist()
+        refresh_in_background(label, refresh)
+        return result, False
+    
+    # A request is needed anyway, so points due a refresh ride along in the same batch
+    points = list(stale) + [point for point in revalidate if point not in stale]
+    fetched = _download_weather_points(cache, points, params, label, counter)
+    if fetched is None:
+        # Stale-if-error: an old forecast beats none
+        served = [road for point, roads in stale.items() if point in cache for road in roads]
+        for road in served:
+            bridge = BRIDGES[road]
+            result[road] = cache[(bridge['latitude'], bridge['longitude'])]['data']
+        if served:
+            age = max((now - cache[point]['timestamp']).total_seconds() for point in stale if point in cache)
+            _log(f"Serving last good {label} data for {', '.join(served)} ({_format_age(age)} old)")
+            count(f'{counter}_stale_served', len(served))
+        return result, False
+    
+    for point, roads in stale.items():
+        for road in roads:
+            result[road] = fetched[point]
+    return result, True
+
+def fetch_weather(stale_while_revalidate=WEATHER_STALE_WHILE_REVALIDATE):
+    """
+    Fetch weather for every bridge from Open-Meteo API (no API key needed)
+    Returns: dict bridge -> Open-Meteo response; each point is cached with its own TTL
+    """
+    if not _weather_cache:
+        _restore_weather_cache()
+    data, changed = _fetch_weather_points(_weather_cache, WEATHER_PARAMS, 'weather', 'weather',
+                                          stale_while_revalidate, persist=_persist_weather_cache)
+    if changed:
+        _persist_weather_cache()
+    return data
+
+def parse_bridge_weather(weather_data):
+    """parse_weather_data for each bridge's response; None if there is none"""
+    return {road: parse_weather_data(data) for road, data in weather_data.items()} if weather_data else None
 
 def parse_weather_data(weather_data):
     """Parse Open-Meteo weather response and extract current conditions"""
@@ -87,7 +1004,7 @@ def parse_weather_data(weather_data):
         temperature = weather_data['current_weather'].get('temperature')
         wind_speed_kmh = weather_data['current_weather'].get('windspeed')
     
-    wind_speed_mph = wind_speed_kmh * 0.621371 if wind_speed_kmh is not None else None
+    wind_speed_mph = wind_speed_kmh * KMH_TO_MPH if wind_speed_kmh is not None else None
     
     # Get today's max rain probability and max gust from hourly data
     rain_prob = None
@@ -110,7 +1027,7 @@ def parse_weather_data(weather_data):
         if 'windgusts_10m' in hourly and hourly['windgusts_10m']:
             gusts = hourly['windgusts_10m']
             max_gust_kmh = max(gusts)
-            max_gust_mph = max_gust_kmh * 0.621371
+            max_gust_mph = max_gust_kmh * KMH_TO_MPH
             # Find the time when max gust occurs
             max_idx = gusts.index(max_gust_kmh)
             if 'time' in hourly and max_idx < len(hourly['time']):
@@ -129,195 +1046,855 @@ def get_wind_risk_level(wind_mph):
     """Determine wind risk level based on mph"""
     if wind_mph is None:
         return 'unknown', COLOR_RESET
-    if wind_mph >= 41:
+    if wind_mph >= WIND_HIGH_RISK_MPH:
         return 'HIGH RISK - Likely closure', COLOR_RED
-    elif wind_mph >= 26:
+    elif wind_mph >= WIND_MONITOR_MPH:
         return 'MONITOR - Possible restrictions', COLOR_YELLOW
     else:
         return 'Safe', COLOR_GREEN
 
+def set_wind_thresholds(monitor_mph=None, high_risk_mph=None):
+    """Change the MONITOR / HIGH RISK wind speeds (e.g. to tune them with --replay); None keeps one"""
+    global WIND_MONITOR_MPH, WIND_HIGH_RISK_MPH
+    if monitor_mph is not None:
+        WIND_MONITOR_MPH = monitor_mph
+    if high_risk_mph is not None:
+        WIND_HIGH_RISK_MPH = high_risk_mph
+
 def display_weather(weather):
-    """Display weather information with color coding"""
+    """Display each bridge's weather (from parse_bridge_weather) with color coding"""
+    sys.stdout.write(render_weather(weather))
+
+def render_weather(weather):
+    """The weather section of the text output as one string (see display_weather)"""
     if not weather:
-        print("❌ Weather data unavailable")
-        return
+        return "❌ Weather data unavailable\n"
     
-    print("=" * 70)
-    print("🌤️  SEVERN BRIDGE WEATHER - TODAY")
-    print("=" * 70)
-    print()
+    lines = ["=" * 70, "🌤️  SEVERN BRIDGE WEATHER - TODAY", "=" * 70, ""]
+    for road, bridge in BRIDGES.items():
+        if weather.get(road):
+            lines.append(f"{COLOR_BOLD}{bridge['name']}{COLOR_RESET}")
+            _render_bridge_weather(lines, weather[road])
     
+    lines += ["Wind Risk Levels:",
+              f"  {COLOR_GREEN}• 0-25 mph: Safe{COLOR_RESET}",
+              f"  {COLOR_YELLOW}• 26-40 mph: Monitor - possible restrictions{COLOR_RESET}",
+              f"  {COLOR_RED}• 41+ mph: High risk - likely closure{COLOR_RESET}",
+              ""]
+    return "\n".join(lines) + "\n"
+
+def _render_bridge_weather(lines, weather):
     if weather['temperature'] is not None:
-        print(f"🌡️  Current Temperature: {weather['temperature']:.1f}°C")
+        lines.append(f"🌡️  Current Temperature: {weather['temperature']:.1f}°C")
     
     if weather['rain_probability'] is not None:
         rain_text = f"🌧️  Max Rain Probability Today: {weather['rain_probability']}%"
         if weather.get('rain_time'):
-            # Extract just the hour from ISO timestamp (e.g., "2026-01-29T14:00" -> "14:00")
-            time_str = weather['rain_time'].split('T')[1] if 'T' in weather['rain_time'] else weather['rain_time']
-            rain_text += f" (at {time_str})"
-        print(rain_text)
+            # Just the hour from the ISO timestamp (e.g., "2026-01-29T14:00" -> "14:00")
+            rain_text += f" (at {weather['rain_time'].rpartition('T')[2]})"
+        lines.append(rain_text)
     
-    print()
+    lines.append("")
     
     if weather['wind_speed_mph'] is not None:
         risk_level, color = get_wind_risk_level(weather['wind_speed_mph'])
-        print(f"💨 Current Wind Speed: {color}{weather['wind_speed_mph']:.1f} mph{COLOR_RESET}")
-        print(f"   Status: {color}{COLOR_BOLD}{risk_level}{COLOR_RESET}")
+        lines.append(f"💨 Current Wind Speed: {color}{weather['wind_speed_mph']:.1f} mph{COLOR_RESET}")
+        lines.append(f"   Status: {color}{COLOR_BOLD}{risk_level}{COLOR_RESET}")
     
     if weather['max_gust_mph'] is not None:
         risk_level, color = get_wind_risk_level(weather['max_gust_mph'])
-        print()
         gust_text = f"🌪️  Max Wind Gust Today: {color}{weather['max_gust_mph']:.1f} mph{COLOR_RESET}"
         if weather.get('gust_time'):
-            time_str = weather['gust_time'].split('T')[1] if 'T' in weather['gust_time'] else weather['gust_time']
-            gust_text += f" (at {time_str})"
-        print(gust_text)
-        print(f"   Status: {color}{COLOR_BOLD}{risk_level}{COLOR_RESET}")
+            gust_text += f" (at {weather['gust_time'].rpartition('T')[2]})"
+        lines += ["", gust_text, f"   Status: {color}{COLOR_BOLD}{risk_level}{COLOR_RESET}"]
     
+    lines.append("")
+
+def fetch_forecast():
+    """Fetch the multi-day hourly forecast for every bridge; returns dict bridge -> Open-Meteo response"""
+    data, _ = _fetch_weather_points(_forecast_cache, FORECAST_PARAMS, f"{FORECAST_DAYS}-day forecast", 'forecast')
+    return data
+
+def _forecast_hours(weather_data):
+    """Hourly times of an Open-Meteo response as aware UTC datetimes (ISO local times or unix seconds)"""
+    offset = timezone(timedelta(seconds=weather_data.get('utc_offset_seconds', 0)))
+    hours = []
+    for value in weather_data['hourly']['time']:
+        if isinstance(value, (int, float)):
+            hours.append(datetime.fromtimestamp(value, timezone.utc))
+        else:
+            parsed = datetime.fromisoformat(value)
+            hours.append((parsed if parsed.tzinfo else parsed.replace(tzinfo=offset)).astimezone(timezone.utc))
+    return hours
+
+def _hourly_risk_levels(wind_mph, gust_mph):
+    """Per-hour risk level (0 Safe, 1 MONITOR, 2 HIGH RISK) from the worse of wind and gust"""
+    if _numpy() is not None:
+        worst = np.fmax(np.asarray(wind_mph, dtype=np.float64), np.asarray(gust_mph, dtype=np.float64))
+        return (worst >= WIND_MONITOR_MPH).astype(np.int8) + (worst >= WIND_HIGH_RISK_MPH)
+    levels = []
+    for wind, gust in zip(wind_mph, gust_mph):
+        worst = max((v for v in (wind, gust) if v is not None and v == v), default=0)
+        levels.append((worst >= WIND_MONITOR_MPH) + (worst >= WIND_HIGH_RISK_MPH))
+    return levels
+
+def _close_gaps(levels, hours):
+    """
+    Rolling-window smoothing: a rolling max then a rolling min over `hours`
+    (a morphological closing), so dips shorter than the window between risky
+    hours are filled in without stretching a window's outer edges
+    """
+    if hours <= 1 or len(levels) == 0:
+        return levels
+    pad = hours - 1
+    if _numpy() is not None:
+        windows = np.lib.stride_tricks.sliding_window_view
+        dilated = windows(np.pad(levels, (pad, pad)), hours).max(axis=1)
+        return windows(dilated, hours).min(axis=1)
+    padded = [0] * pad + list(levels) + [0] * pad
+    dilated = [max(padded[i:i + hours]) for i in range(len(padded) - pad)]
+    return [min(dilated[i:i + hours]) for i in range(len(dilated) - pad)]
+
+def forecast_wind_windows(weather_data, smoothing_hours=FORECAST_SMOOTHING_HOURS):
+    """
+    Predicted restriction/closure windows from a multi-day hourly forecast
+    
+    Every hour is classified against the MONITOR/HIGH RISK thresholds in one
+    vectorised pass (plain Python without NumPy), short calm gaps are closed
+    with rolling-window smoothing and consecutive risky hours are merged.
+    Returns: list of dicts with 'start'/'end' (aware UTC; end is exclusive),
+    'risk' ('HIGH RISK'/'MONITOR', the worst hour), 'peak_gust_mph', 'peak_time'
+    and 'max_rain_probability'
+    """
+    hourly = (weather_data or {}).get('hourly') or {}
+    if not hourly.get('time'):
+        return []
+    hours = _forecast_hours(weather_data)
+    n = len(hours)
+    as_mph = lambda key: [v * KMH_TO_MPH if v is not None else math.nan for v in (hourly.get(key) or [None] * n)]
+    gust_mph, wind_mph = as_mph('windgusts_10m'), as_mph('windspeed_10m')
+    rain = [v if v is not None else 0 for v in (hourly.get('precipitation_probability') or [0] * n)]
+    
+    levels = _hourly_risk_levels(wind_mph, gust_mph)
+    smoothed = _close_gaps(levels, smoothing_hours)
+    if _numpy() is not None:
+        risky = np.concatenate(([False], np.asarray(smoothed) > 0, [False]))
+        edges = np.flatnonzero(risky[1:] != risky[:-1]).tolist()
+        runs = list(zip(edges[0::2], edges[1::2]))
+    else:
+        runs, start = [], None
+        for i, level in enumerate(list(smoothed) + [0]):
+            if level and start is None:
+                start = i
+            elif not level and start is not None:
+                runs.append((start, i))
+                start = None
+    
+    windows = []
+    for start, end in runs:
+        worst = max(levels[start:end])
+        gusts = [g if g == g else -1 for g in gust_mph[start:end]]  # NaN (missing) never peaks
+        peak = start + gusts.index(max(gusts))
+        windows.append({
+            'start': hours[start],
+            'end': hours[end - 1] + timedelta(hours=1),
+            'risk': 'HIGH RISK' if worst >= 2 else 'MONITOR',
+            'peak_gust_mph': gust_mph[peak] if gust_mph[peak] == gust_mph[peak] else None,
+            'peak_time': hours[peak],
+            'max_rain_probability': max(rain[start:end]),
+        })
+    return windows
+
+def forecast_outlook(closures, weather_data, now=None, bridge=None):
+    """
+    Predicted wind windows alongside the planned-closure timeline for the forecast horizon
+    Returns: (windows, planned) where each window also lists the Severn closures
+    scheduled to overlap it under 'planned', and planned is every Severn closure
+    starting before the horizon ends; bridge ('M4'/'M48') limits both to its closures
+    """
+    now = now or datetime.now(timezone.utc)
+    windows = [window for window in forecast_wind_windows(weather_data) if window['end'] > now]
+    hourly = (weather_data or {}).get('hourly') or {}
+    horizon = (_forecast_hours(weather_data)[-1] + timedelta(hours=1) if hourly.get('time')
+               else now + timedelta(days=FORECAST_DAYS))
+    timeline = get_timeline(closures or [])
+    on_bridge = lambda closure: bridge is None or classify_closure(closure)['bridge'] == bridge
+    for window in windows:
+        start, end = window['start'], window['end']
+        window['planned'] = [closure for closure in timeline.active_at(start) if on_bridge(closure)] + [
+            closure for closure in timeline.starting_between(start, end)
+            if start < closure.start_time < end and on_bridge(closure)]
+    return windows, [closure for closure in timeline.starting_between(now, horizon) if on_bridge(closure)]
+
+def _time_after(when, start):
+    """'14:00' on start's (local) day, else with its date: 'Sat 18 Jan 02:00'"""
+    return when.strftime('%H:%M' if when.date() == start.date() else '%a %d %b %H:%M')
+
+def display_forecast(windows, planned, title="SEVERN BRIDGES"):
+    """Display predicted wind windows and the planned closures over the same days"""
+    print("=" * 70)
+    print(f"🌬️  {title.upper()} - WIND RISK OUTLOOK, NEXT {FORECAST_DAYS} DAYS")
+    print("=" * 70)
+    if not windows:
+        print(f"\n{COLOR_GREEN}✓ No hours forecast at or above {WIND_MONITOR_MPH} mph{COLOR_RESET}")
+    for window in windows:
+        color = COLOR_RED if window['risk'] == 'HIGH RISK' else COLOR_YELLOW
+        start, end = window['start'].astimezone(), window['end'].astimezone()
+        print(f"\n{color}{COLOR_BOLD}{window['risk']}{COLOR_RESET} "
+              f"{start.strftime('%a %d %b %H:%M')} → {_time_after(end, start)}")
+        if window['peak_gust_mph'] is not None:
+            print(f"   Peak gust {color}{window['peak_gust_mph']:.0f} mph{COLOR_RESET} "
+                  f"at {_time_after(window['peak_time'].astimezone(), start)}, "
+                  f"rain up to {window['max_rain_probability']}%")
+        for closure in window['planned']:
+            print(f"   📅 Closure scheduled: {closure.road} {closure.direction} - {closure.location}")
     print()
-    print("Wind Risk Levels:")
-    print(f"  {COLOR_GREEN}• 0-25 mph: Safe{COLOR_RESET}")
-    print(f"  {COLOR_YELLOW}• 26-40 mph: Monitor - possible restrictions{COLOR_RESET}")
-    print(f"  {COLOR_RED}• 41+ mph: High risk - likely closure{COLOR_RESET}")
+    print("=" * 70)
+    print("📅 CLOSURES STARTING IN THE SAME PERIOD")
+    print("=" * 70)
+    if not planned:
+        print("\n✓ No closures starting")
+    for closure in planned:
+        print(f"\n• {closure.road} {closure.direction} - {closure.location}")
+        print(f"  {closure.start_time.astimezone().strftime('%a %d %b %H:%M')} → "
+              f"{closure.end_time.astimezone().strftime('%a %d %b %H:%M')}")
+    print()
+
+def run_forecast():
+    """Show predicted wind restriction/closure windows next to planned closures for the coming days"""
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='fetch') as pool:
+        forecast_future = pool.submit(fetch_forecast)
+        closures = fetch_closures_stream()
+        forecasts = forecast_future.result()
+    if not forecasts:
+        print("❌ Failed to fetch forecast")
+        return
     print()
+    for road, weather_data in forecasts.items():
+        display_forecast(*forecast_outlook(closures, weather_data, bridge=road), title=BRIDGES[road]['name'])
+
+def _spool_hashed(chunks):
+    """
+    Hash a body's chunks as they arrive and spool them for a later parse
+    The spool stays in memory up to CLOSURES_SPOOL_MEMORY bytes, then moves to a
+    temporary file, so a large feed costs neither its size in memory nor a join.
+    Returns: (CLOSURES_DIGEST hex digest, spool positioned at the start)
+    """
+    import hashlib
+    import tempfile
+    digest = hashlib.new(CLOSURES_DIGEST)
+    spool = tempfile.SpooledTemporaryFile(max_size=CLOSURES_SPOOL_MEMORY)
+    hash_seconds = 0.0  # hashing and spooling, not the download between chunks
+    try:
+        for chunk in chunks:
+            started = time.perf_counter()
+            digest.update(chunk)
+            spool.write(chunk)
+            hash_seconds += time.perf_counter() - started
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    finally:
+        record_stage('hash', hash_seconds)
+    return digest.hexdigest(), spool
 
 def fetch_closures():
-    """Fetch closure data from National Highways API"""
-    headers = {
-        'Ocp-Apim-Subscription-Key': API_KEY,
-        'Accept': 'application/xml'  # API seems to default to XML
-    }
-    
-    print("Fetching data from National Highways API...")
-    
-    req = urllib.request.Request(BASE_URL, headers=headers)
+    """Fetch closure data from National Highways API; returns the raw XML bytes or None"""
+    _log("Fetching data from National Highways API...")
     
     try:
-        with urllib.request.urlopen(req, timeout=10, context=SSL_CONTEXT) as response:
-            if response.status == 200:
-                print(f"✓ API call successful (Status: {response.status})")
-                return response.read().decode('utf-8')
-            else:
-                print(f"✗ API call failed (Status: {response.status})")
-                return None
+        headers = {
+            'Ocp-Apim-Subscription-Key': get_api_key(),
+            'Accept': 'application/xml'  # API seems to default to XML
+        }
+        status, chunks = http_get(BASE_URL, headers)
+        if status == 200:
+            _log(f"✓ API call successful (Status: {status})")
+            return b''.join(chunks)  # parse_xml_closures takes the bytes as they are
+        else:
+            _log(f"✗ API call failed (Status: {status})")
+            return None
     except Exception as e:
-        print(f"✗ API call failed: {e}")
+        _log(f"✗ API call failed: {e}")
+        return None
+
+def closures_age(now=None):
+    """Seconds since the cached closures were last fetched or revalidated, or None if there are none"""
+    if _cache['timestamp'] is None or _cache['data'] is None:
         return None
+    return ((now or datetime.now(timezone.utc)) - _cache['timestamp']).total_seconds()
+
+def fetch_closures_stream(max_age=CLOSURES_CACHE_DURATION, stale_while_revalidate=CLOSURES_STALE_WHILE_REVALIDATE):
+    """Fetch closures as fetch_closures_snapshot() does and return just the closures, or None"""
+    return fetch_closures_snapshot(max_age, stale_while_revalidate)[0]
 
-def parse_xml_closures(xml_data):
-    """Parse XML response and extract relevant closure information"""
+def fetch_closures_snapshot(max_age=CLOSURES_CACHE_DURATION, stale_while_revalidate=CLOSURES_STALE_WHILE_REVALIDATE):
+    """
+    Fetch closures and parse them straight off the HTTP response (no full-body buffering)
+    
+    A cached result younger than max_age seconds (in memory or on disk from a
+    previous run) is returned without any request. Up to stale_while_revalidate
+    seconds older than that it is still returned at once while a background thread
+    refreshes it. Otherwise the stored validators are sent, so an unchanged feed
+    comes back as 304 and skips the download, the hash and the parse; a 200 whose
+    digest matches keeps the cached list (see _download_closures). If the
+    request fails, the cached result is returned whatever its age (see closures_age).
+    Returns: (closures, content hash of the feed they were parsed from), or (None, None);
+    the hash is read with the closures, so a background refresh can't pair it with others
+    """
+    if _cache['data'] is None:
+        _restore_closures_cache()
     
     # Check cache
-    data_hash = hashlib.md5(xml_data.encode()).hexdigest()
-    if _cache['hash'] == data_hash and _cache['data'] is not None:
-        print("Using cached parsed data (no changes detected)")
-        return _cache['data']
+    cache_age = closures_age()
+    if cache_age is not None:
+        if cache_age < max_age:
+            _log(f"Using cached closures ({int(cache_age)} seconds old)")
+            count('closures_cache_hits')
+            return _cached_closures()
+        if cache_age < max_age + stale_while_revalidate:
+            _log(f"Using cached closures ({_format_age(cache_age)} old), refreshing in the background")
+            count('closures_stale_served')
+            snapshot = _cached_closures()
+            refresh_in_background('closures', _download_closures)
+            return snapshot
     
-    root = ET.fromstring(xml_data)
+    closures, data_hash = _download_closures()
+    if closures is None and _cache['data'] is not None:
+        # Stale-if-error: the last good answer, marked with its age, beats none
+        _log(f"Serving last good closures ({_format_age(closures_age())} old)")
+        count('closures_stale_served')
+        return _cached_closures()
+    return closures, data_hash
+
+def _download_closures():
+    """
+    Request the closures feed, hash the raw chunks as they arrive and update the cache
+    The body is spooled (see _spool_hashed) and the digest compared with the cached
+    one before anything is decoded or parsed: a feed that came back unchanged
+    without a 304 keeps the cached list (with its classifications and timeline),
+    the disk cache isn't rewritten, and it costs only the transfer. Otherwise the
+    spool is fed to the streaming parser a chunk at a time.
+    Returns: (closures, content hash), or (None, None) on failure
+    """
+    now = datetime.now(timezone.utc)
+    _log("Fetching data from National Highways API (streaming)...")
     
-    # Define namespace (if present)
-    ns = {}
+    try:
+        headers = {
+            'Ocp-Apim-Subscription-Key': get_api_key(),
+            'Accept': 'application/xml'
+        }
+        status, chunks = http_get(BASE_URL, headers, conditional=_cache['data'] is not None)
+        if status == HTTP_NOT_MODIFIED:
+            _log("✓ Closures not modified since last fetch (Status: 304)")
+            count('closures_not_modified')
+            with _cache_lock:
+                _cache['timestamp'] = now
+            _persist_closures_cache()
+            return _cached_closures()
+        if status != 200:
+            _log(f"✗ API call failed (Status: {status})")
+            return None, None
+        _log(f"✓ API call successful (Status: {status})")
+        
+        data_hash, spool = _spool_hashed(chunks)
+        with spool:
+            with _cache_lock:
+                unchanged = data_hash == _cache['hash'] and _cache['data'] is not None
+                if unchanged:
+                    _cache['timestamp'] = now
+                    closures = _cache['data']
+            if unchanged:
+                _log("Using cached parsed data (no changes detected)")
+                count('closures_unchanged')
+                return closures, data_hash
+            count('closures_cache_misses')
+            closures = parse_xml_stream(iter(lambda: spool.read(XML_CHUNK_SIZE), b''))
+    except Exception as e:
+        _log(f"✗ API call failed: {e}")
+        return None, None
     
-    closures = []
-    situations = root.findall('.//situation', ns)
+    _set_closures_cache(now, data_hash, closures)
+    _persist_closures_cache()
+    return closures, data_hash
+
+def _intern(value):
+    return sys.intern(value) if value is not None else None
+
+class _Vocabulary(str, Enum):
+    """
+    A feed vocabulary as a str enum: members compare, hash and format as their value
+    The members listed are the values the code knows; any other value the feed
+    sends becomes a member the first time it is seen, so each value exists once.
+    """
+    __str__ = str.__str__
+    __format__ = str.__format__
     
-    print(f"Found {len(situations)} total situations")
+    @classmethod
+    def _missing_(cls, value):
+        if not isinstance(value, str):
+            return None
+        member = str.__new__(cls, value)
+        member._name_ = member._value_ = value
+        return cls._value2member_map_.setdefault(value, member)
     
-    for situation in situations:
-        for record in situation.findall('.//sitRoadOrCarriagewayOrLaneManagement', ns):
-            # Extract key information
-            road_name = record.find('.//roadName')
-            
-            # Early filtering: Skip if not M4 or M48
-            road = road_name.text if road_name is not None else "Unknown"
-            if road not in ['M4', 'M48']:
+    @classmethod
+    def of(cls, value):
+        """The member for a feed value (None stays None)"""
+        if value is None:
+            return None
+        member = cls._value2member_map_.get(value)
+        return member if member is not None else cls(value)
+
+class ClosureStatus(_Vocabulary):
+    ACTIVE = 'active'
+    PLANNED = 'planned'
+    SUSPENDED = 'suspended'
+    UNKNOWN = 'Unknown'
+
+class Direction(_Vocabulary):
+    EAST_BOUND = 'eastBound'
+    WEST_BOUND = 'westBound'
+    NORTH_BOUND = 'northBound'
+    SOUTH_BOUND = 'southBound'
+    BOTH_DIRECTIONS = 'bothDirections'
+    UNKNOWN = 'unknown'
+
+class Cause(_Vocabulary):
+    ROAD_MAINTENANCE = 'roadMaintenance'
+    ROADWORKS = 'roadworks'
+    POOR_ENVIRONMENT = 'poorEnvironment'
+    ACCIDENT = 'accident'
+    OBSTRUCTION = 'obstruction'
+    UNKNOWN = 'unknown'
+
+class Closure:
+    """
+    One closure record on a corridor road as produced by the parser
+    
+    Timestamps are parsed once into aware UTC datetimes (start_time/end_time,
+    None when missing or unparseable) and the posList into geometry/bbox; the
+    status, direction and cause are ClosureStatus, Direction and Cause members
+    (str enums) and road and probability interned strings. classification is
+    filled in by classify_closure(). closure['field'] and closure.get() read the
+    fields dict-style, but the functions taking closures need Closure objects:
+    convert dict records with Closure.from_dict(), anything else is a TypeError.
+    """
+    __slots__ = ('road', 'location', 'description', 'status', 'probability', 'cause',
+                 'start', 'end', 'coordinates', 'direction', 'situation_id', 'version',
+                 'start_time', 'end_time', 'geometry', 'bbox', 'classification')
+    
+    def __init__(self, road, location, description, status, probability, cause, start, end,
+                 coordinates, direction, situation_id=None, version=None):
+        self.road = _intern(road)
+        self.location = location
+        self.description = description
+        self.status = ClosureStatus.of(status)
+        self.probability = _intern(probability)
+        self.cause = Cause.of(cause)
+        self.start = start
+        self.end = end
+        self.coordinates = coordinates
+        self.direction = Direction.of(direction)
+        self.situation_id = situation_id
+        self.version = version
+        self.start_time = parse_timestamp(start)
+        self.end_time = parse_timestamp(end)
+        self.geometry, self.bbox = parse_geometry(coordinates)
+        self.classification = None
+    
+    @classmethod
+    def from_dict(cls, record):
+        """A Closure from a dict record with the parser's field names (CLOSURE_DEFAULTS fill the gaps)"""
+        return cls(*(record.get(key, default) for key, default in CLOSURE_DEFAULTS.items()),
+                   record.get('situation_id'), record.get('version'))
+    
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+    
+    def __repr__(self):
+        return f"Closure({self.road!r}, {self.location!r}, status={self.status!r}, direction={self.direction!r})"
+
+def _not_a_closure(value):
+    return TypeError(f"expected a Closure, got {type(value).__name__} (convert dict records with Closure.from_dict)")
+
+def parse_xml_stream(chunks):
+    """
+    Incrementally parse DATEX II XML from an iterable of byte chunks
+    
+    Each record's fields are collected in one pass as its elements close, records
+    on other roads are dropped as soon as their roadName is seen, and finished
+    situations are cleared and detached so memory stays bounded by one situation.
+    Situations whose id and version match the previous parse are not re-read:
+    their earlier records (and any classification cached on them) are reused.
+    Returns a list of Closure records.
+    """
+    import xml.etree.ElementTree as ET
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack = []           # open elements, root first
+    in_situation = 0     # depth of open <situation> elements
+    situation = None     # (id, version) of the open situation, if it has both
+    reused = False       # open situation is unchanged since the last parse
+    situation_closures = []
+    record = None        # fields of the record being read (None outside a record)
+    skip_record = False  # record is on a road no corridor watches
+    roads = corridor_roads()
+    situation_count = 0
+    reused_count = 0
+    kept_count = 0       # situations with at least one record on a corridor road
+    closures = []
+    situations = {}
+    parse_seconds = 0.0  # excludes waiting on `chunks`, which may be a live download
+    
+    for chunk in chunks:
+        started = time.perf_counter()
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            tag = elem.tag
+            if event == 'start':
+                stack.append(elem)
+                if tag == 'situation':
+                    in_situation += 1
+                    if in_situation == 1:
+                        situation = (elem.get('id'), elem.get('version'))
+                        previous = _situations.get(situation[0]) if all(situation) else None
+                        reused = previous is not None and previous[0] == situation[1]
+                        situation_closures = list(previous[1]) if reused else []
+                elif tag == RECORD_TAG and in_situation and record is None and not reused:
+                    record = {}
+                    skip_record = False
                 continue
             
-            location_desc = record.find('.//locationDescription')
-            comment = record.find('.//comment')
-            validity_status = record.find('.//validityStatus')
-            start_time = record.find('.//overallStartTime')
-            end_time = record.find('.//overallEndTime')
-            pos_list = record.find('.//posList')
-            probability = record.find('.//probabilityOfOccurrence')
-            cause_type = record.find('.//causeType')
-            management_type = record.find('.//roadOrCarriagewayOrLaneManagementType/value')
-            
-            # Get text values safely
-            location = location_desc.text if location_desc is not None else "Unknown"
-            description = comment.text if comment is not None else "No description"
-            status = validity_status.text if validity_status is not None else "Unknown"
-            prob = probability.text if probability is not None else "unknown"
-            cause = cause_type.text if cause_type is not None else "unknown"
-            
-            # Extract direction information
-            direction_elem = record.find('.//directionOnLinearSection')
-            direction = direction_elem.text if direction_elem is not None else "unknown"
-            
-            closure = {
-                'road': road,
-                'location': location,
-                'description': description,
-                'status': status,
-                'probability': prob,
-                'cause': cause,
-                'start': start_time.text if start_time is not None else None,
-                'end': end_time.text if end_time is not None else None,
-                'coordinates': pos_list.text if pos_list is not None else None,
-                'direction': direction
-            }
-            closures.append(closure)
+            stack.pop()
+            if record is not None:
+                if tag == RECORD_TAG:
+                    if not skip_record and record.get('road', CLOSURE_DEFAULTS['road']) in roads:
+                        situation_closures.append(Closure(
+                            *(record.get(key, default) for key, default in CLOSURE_DEFAULTS.items()),
+                            situation_id=situation[0], version=situation[1]))
+                    record = None
+                    elem.clear()
+                elif not skip_record:
+                    key = RECORD_FIELDS.get(tag)
+                    if key is not None and key not in record:
+                        record[key] = elem.text
+                        if key == 'road' and elem.text not in roads:
+                            skip_record = True
+            elif tag == 'situation':
+                in_situation -= 1
+                if in_situation == 0:
+                    situation_count += 1
+                    reused_count += reused
+                    kept_count += bool(situation_closures)
+                    closures.extend(situation_closures)
+                    if all(situation):
+                        situations[situation[0]] = (situation[1], situation_closures)
+                    situation_closures = []
+                    reused = False
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+        parse_seconds += time.perf_counter() - started
+    parser.close()
+    record_stage('parse', parse_seconds)
+    count('situations_seen', situation_count)
+    count('situations_unchanged', reused_count)
+    count('situations_kept', kept_count)
+    
+    # Situations missing from this feed drop out of the fingerprint cache
+    _situations.clear()
+    _situations.update(situations)
+    
+    _log(f"Found {situation_count} total situations ({reused_count} unchanged)")
+    return closures
+
+def parse_xml_closures(xml_data, data_hash=None):
+    """
+    Parse XML response (str or bytes) and extract relevant closure information
+    data_hash: the body's CLOSURES_DIGEST hex digest if already known (e.g. from
+    _download_closures while streaming), so the parse cache check needn't hash it again
+    """
+    if isinstance(xml_data, str):
+        xml_data = xml_data.encode()
+    
+    # Check cache
+    if data_hash is None:
+        import hashlib
+        with stage_timer('hash'):
+            data_hash = hashlib.new(CLOSURES_DIGEST, xml_data).hexdigest()
+    if _cache['hash'] == data_hash and _cache['data'] is not None:
+        _log("Using cached parsed data (no changes detected)")
+        count('closures_cache_hits')
+        return _cache['data']
+    count('closures_cache_misses')
+    
+    closures = parse_xml_stream([xml_data])
     
     # Cache the result
-    _cache['hash'] = data_hash
-    _cache['data'] = closures
+    _set_closures_cache(datetime.now(timezone.utc), data_hash, closures)
     
     return closures
 
+def load_classification_rules(path):
+    """Replace the classification rules from a JSON file; they are recompiled on next use"""
+    global CLASSIFICATION_RULES
+    with open(path) as f:
+        CLASSIFICATION_RULES = json.load(f)
+    _corridors_changed()
+
+def register_corridor(name, title, roads, area=None, directions=('eastBound', 'westBound'), titles=None):
+    """
+    Add (or replace) a monitored corridor
+    roads maps road name -> location keywords; area is an optional
+    (lat_min, lat_max, lon_min, lon_max) box, registered with register_area().
+    The next parse re-reads every situation so records on new roads are kept.
+    """
+    if area is not None:
+        register_area(name, *area)
+    CORRIDORS[name] = {'name': title, 'roads': roads, 'area': name if area is not None else None,
+                       'directions': tuple(directions)}
+    if titles:
+        CORRIDORS[name]['titles'] = titles
+    _corridors_changed()
+
+def _corridors_changed():
+    """Drop everything derived from the corridors and rules (compiled rules, road map, parse fingerprints)"""
+    global _rule_engine, _road_corridors
+    _rule_engine = None
+    _road_corridors = None
+    _situations.clear()
+    _corridor_cache['closures'] = None
+
+def _corridor_keywords(name):
+    """A corridor's road -> location keywords"""
+    roads = CORRIDORS[name]['roads']
+    return CLASSIFICATION_RULES['roads'] if roads is None else roads
+
+def _corridor_titles(name):
+    """A corridor's road -> status title, in display order"""
+    corridor = CORRIDORS[name]
+    return corridor.get('titles') or {road: corridor['name'] for road in _corridor_keywords(name)}
+
+def corridor_roads():
+    """Road name -> names of the corridors watching it (the parser's filter and the fan-out map)"""
+    global _road_corridors
+    if _road_corridors is None:
+        road_corridors = {}
+        for name in CORRIDORS:
+            for road in list(_corridor_keywords(name)) + list(_corridor_titles(name)):
+                if name not in road_corridors.setdefault(road, ()):
+                    road_corridors[road] += (name,)
+        _road_corridors = road_corridors
+    return _road_corridors
+
+def _get_rule_engine():
+    """
+    Compile the classification rules once: one alternation regex per corridor and
+    road (longest keyword first, so 'junction 21' wins over 'junction 2') and one
+    for the full-closure phrases
+    """
+    global _rule_engine
+    if _rule_engine is None:
+        corridors = {name: {road: re.compile('|'.join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)),
+                                             re.IGNORECASE)
+                            for road, keywords in _corridor_keywords(name).items() if keywords}
+                     for name in CORRIDORS}
+        closed = re.compile('|'.join(map(re.escape, CLASSIFICATION_RULES['closed_phrases'])), re.IGNORECASE)
+        _rule_engine = {'corridors': corridors, 'closed': closed}
+    return _rule_engine
+
+def _match_location(closure, corridor='severn'):
+    """Single scan of the location with the corridor's keyword regex for the road; returns (matched, junction or None)"""
+    pattern = _get_rule_engine()['corridors'].get(corridor, {}).get(closure.road)
+    if pattern is None:
+        return False, None
+    junction = None
+    matched = False
+    for match in pattern.finditer(closure.location):
+        matched = True
+        number = _JUNCTION_KEYWORD.match(match.group().lower())
+        if number:
+            junction = 'J' + number.group(1)
+            break
+    return matched, junction
+
+def closure_severity(description):
+    """'CLOSED' for a full carriageway closure, otherwise 'RESTRICTED'"""
+    return "CLOSED" if description and _get_rule_engine()['closed'].search(description) else "RESTRICTED"
+
+def classify_closure(closure):
+    """
+    Classify a closure once, caching the result on it
+    Returns: dict with 'corridors' (names of the corridors it is in), 'severn' (bool),
+    'bridge' ('M48'/'M4'/None), 'junction' (e.g. 'J23' or None), 'severity'
+    ('CLOSED'/'RESTRICTED' if active) and the cleaned 'description'
+    """
+    try:
+        classification = closure.classification
+    except AttributeError:
+        raise _not_a_closure(closure) from None
+    if classification is None:
+        started = time.perf_counter()
+        corridors = []
+        junction = None
+        areas = None
+        # Only the corridors watching this road are tried
+        for name in corridor_roads().get(closure.road, ()):
+            matched, corridor_junction = _match_location(closure, name)
+            if not matched:
+                if areas is None:
+                    areas = areas_for_closure(closure)
+                matched = CORRIDORS[name]['area'] in areas
+            if matched:
+                corridors.append(name)
+                junction = junction or corridor_junction
+        classification = closure.classification = {
+            'corridors': tuple(corridors),
+            'severn': 'severn' in corridors,
+            'bridge': _corridor_road(closure, BRIDGES) if closure.road in _corridor_keywords('severn') else None,
+            'junction': junction,
+            'severity': closure_severity(closure.description),
+            'description': clean_description(closure.description),
+        }
+        record_stage('classify', time.perf_counter() - started)
+    return classification
+
+def _corridor_road(closure, roads):
+    """Which of roads a closure is on, by road name or location mention (longest name first, so M48 beats M4)"""
+    for road in sorted(roads, key=len, reverse=True):
+        if road in closure.road or road in closure.location:
+            return road
+    return None
+
+def closures_by_corridor(closures):
+    """
+    Fan a closures list out to the corridors in one pass: corridor name -> its closures
+    Reused while the same list is current (e.g. across 304s), like get_timeline().
+    """
+    if _corridor_cache['closures'] is not closures:
+        corridors = {name: [] for name in CORRIDORS}
+        for closure in closures:
+            for name in classify_closure(closure)['corridors']:
+                corridors[name].append(closure)
+        _corridor_cache['corridors'] = corridors
+        _corridor_cache['closures'] = closures
+    return _corridor_cache['corridors']
+
 def check_severn_bridge(closure):
     """Check if closure is near Severn Bridge based on coordinates or location"""
-    location_lower = closure['location'].lower()
-    road = closure['road']
-    
-    # M48 Severn Bridge specific - Junction 1 and 2 only
-    if road == 'M48':
-        if any(j in location_lower for j in ['j1', 'j2', 'junction 1', 'junction 2', 'severn']):
-            return True
-    
-    # M4 Second Severn Crossing / Prince of Wales Bridge
-    # Wales side: J23, J24 (westbound into Wales)
-    # England side: J21, J22 (eastbound into England)
-    if road == 'M4':
-        # Check for Severn Bridge specific junctions
-        if any(j in location_lower for j in ['j21', 'j22', 'j23', 'j24', 
-                                               'junction 21', 'junction 22', 
-                                               'junction 23', 'junction 24', 
-                                               'severn']):
-            return True
-        
-        # Check for "Wales" or England/Wales border mentions
-        if 'wales' in location_lower or 'welsh border' in location_lower:
-            return True
+    matched, _ = _match_location(closure)
+    if matched:
+        return True
     
     # Check coordinates if available (definitive location check)
-    if closure['coordinates']:
-        try:
-            coords = closure['coordinates'].split()
-            # Coordinates are in lat lon pairs
-            for i in range(0, len(coords)-1, 2):
-                lat = float(coords[i])
-                lon = float(coords[i+1])
-                
-                if (SEVERN_BRIDGE_AREA['lat_min'] <= lat <= SEVERN_BRIDGE_AREA['lat_max'] and
-                    SEVERN_BRIDGE_AREA['lon_min'] <= lon <= SEVERN_BRIDGE_AREA['lon_max']):
-                    return True
-        except (ValueError, IndexError):
-            pass
+    if 'severn' in areas_for_closure(closure):
+        return True
     
     return False
 
-def is_currently_active(closure):
+def parse_geometry(pos_list):
+    """
+    Parse a posList ("lat lon lat lon ...") once into a flat array('d') plus its bounding box
+    Returns: (geometry, (lat_min, lat_max, lon_min, lon_max)) or (None, None) without usable points
+    """
+    if not pos_list:
+        return None, None
+    geometry = array('d')
+    for token in pos_list.split():
+        try:
+            geometry.append(float(token))
+        except ValueError:
+            break  # keep the pairs read before the bad value
+    if len(geometry) % 2:
+        geometry.pop()
+    if not geometry:
+        return None, None
+    lats, lons = geometry[0::2], geometry[1::2]
+    return geometry, (min(lats), max(lats), min(lons), max(lons))
+
+def register_area(name, lat_min, lat_max, lon_min, lon_max):
+    """Add (or replace) a monitored area; areas_for_closure picks it up on the next call"""
+    global _area_grid
+    MONITORED_AREAS[name] = {'lat_min': lat_min, 'lat_max': lat_max, 'lon_min': lon_min, 'lon_max': lon_max}
+    _area_grid = None
+
+def _grid_cells(lat_min, lat_max, lon_min, lon_max):
+    """Grid cells covering a bounding box"""
+    lat_cells = range(math.floor(lat_min / AREA_GRID_SIZE), math.floor(lat_max / AREA_GRID_SIZE) + 1)
+    lon_cells = range(math.floor(lon_min / AREA_GRID_SIZE), math.floor(lon_max / AREA_GRID_SIZE) + 1)
+    return [(i, j) for i in lat_cells for j in lon_cells]
+
+def _candidate_areas(bbox):
+    """Names of areas whose bounding box intersects bbox, via the grid index"""
+    global _area_grid
+    if _area_grid is None:
+        _area_grid = {}
+        for name, area in MONITORED_AREAS.items():
+            for cell in _grid_cells(area['lat_min'], area['lat_max'], area['lon_min'], area['lon_max']):
+                _area_grid.setdefault(cell, []).append(name)
+    
+    lat_min, lat_max, lon_min, lon_max = bbox
+    cells = _grid_cells(*bbox)
+    names = MONITORED_AREAS if len(cells) > len(MONITORED_AREAS) else {
+        name for cell in cells for name in _area_grid.get(cell, ())}
+    return [name for name in names
+            if MONITORED_AREAS[name]['lat_min'] <= lat_max and lat_min <= MONITORED_AREAS[name]['lat_max']
+            and MONITORED_AREAS[name]['lon_min'] <= lon_max and lon_min <= MONITORED_AREAS[name]['lon_max']]
+
+def _any_point_in_area(geometry, area):
+    """True if any lat/lon pair of a flat geometry array lies inside the area's box"""
+    lat_min, lat_max = area['lat_min'], area['lat_max']
+    lon_min, lon_max = area['lon_min'], area['lon_max']
+    if len(geometry) >= 2 * VECTORISE_MIN_POINTS and _numpy() is not None:
+        points = np.frombuffer(geometry, dtype=np.float64).reshape(-1, 2)
+        lats, lons = points[:, 0], points[:, 1]
+        return bool(np.any((lats >= lat_min) & (lats <= lat_max) & (lons >= lon_min) & (lons <= lon_max)))
+    return any(lat_min <= geometry[i] <= lat_max and lon_min <= geometry[i + 1] <= lon_max
+               for i in range(0, len(geometry), 2))
+
+def areas_for_closure(closure):
+    """Names of the monitored areas containing any point of the closure's geometry"""
+    geometry, bbox = closure.geometry, closure.bbox
+    if geometry is None:
+        return set()
+    
+    matched = set()
+    for name in _candidate_areas(bbox):
+        area = MONITORED_AREAS[name]
+        # A geometry whose bbox lies wholly inside the area needs no per-point check
+        if (area['lat_min'] <= bbox[0] and bbox[1] <= area['lat_max'] and
+                area['lon_min'] <= bbox[2] and bbox[3] <= area['lon_max']):
+            matched.add(name)
+        elif _any_point_in_area(geometry, area):
+            matched.add(name)
+    return matched
+
+def parse_timestamp(value):
+    """Parse an API ISO-8601 timestamp ('...Z' allowed) to an aware UTC datetime, or None"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)  # the feed's times are UTC
+    return parsed.astimezone(timezone.utc)
+
+def is_severn_closure(closure):
+    """check_severn_bridge via the cached classification, so unchanged situations aren't re-classified"""
+    return classify_closure(closure)['severn']
+
+def is_currently_active(closure, now=None):
     """
     Determine if a closure is CURRENTLY ACTIVE (happening right now)
     
@@ -326,13 +1903,22 @@ def is_currently_active(closure):
     - 'planned': Closure is scheduled but not yet started
     - 'suspended': Closure is cancelled/postponed
     
+    now: evaluate at this (aware) time instead of the clock, for what-if queries;
+    an operator-confirmed closure then counts as over after its end time.
+    
     Returns: (is_active, reason)
     """
-    now = datetime.now(timezone.utc)
-    status = closure['status'].lower()
+    what_if = now is not None
+    now = now or datetime.now(timezone.utc)
+    try:
+        status = closure.status.lower()
+    except AttributeError:
+        raise _not_a_closure(closure) from None
     
     # If status is explicitly 'active', the closure is happening NOW
     if status == 'active':
+        if what_if and closure.end_time and now > closure.end_time:
+            return False, "Past closure"
         return True, "ACTIVE (confirmed by operator)"
     
     # If suspended, it's not active
@@ -341,33 +1927,27 @@ def is_currently_active(closure):
     
     # For 'planned' status, check if we're within the time window
     if status == 'planned':
-        if closure['start'] and closure['end']:
-            try:
-                start_time = datetime.fromisoformat(closure['start'].replace('Z', '+00:00'))
-                end_time = datetime.fromisoformat(closure['end'].replace('Z', '+00:00'))
-                
-                if start_time <= now <= end_time:
-                    # We're in the planned time window
-                    return True, "ACTIVE (within planned time window)"
-                elif now < start_time:
-                    # Future closure
-                    return False, f"Planned for later (starts {start_time.strftime('%H:%M %Z')})"
-                else:
-                    # Past closure
-                    return False, "Past closure"
-            except:
-                pass
+        start_time, end_time = closure.start_time, closure.end_time
+        if start_time and end_time:
+            if start_time <= now <= end_time:
+                # We're in the planned time window
+                return True, "ACTIVE (within planned time window)"
+            elif now < start_time:
+                # Future closure
+                return False, f"Planned for later (starts {start_time.strftime('%H:%M %Z')})"
+            else:
+                # Past closure
+                return False, "Past closure"
         return False, "Planned (time uncertain)"
     
     return False, f"Unknown status: {status}"
 
 def clean_description(description):
     """Remove mile marker references like 201/5-196/0 for better readability"""
-    import re
     # Remove patterns like "201/5-196/0" or "201/5" at the end
-    description = re.sub(r'\s*\d+/\d+-\d+/\d+\s*', ' ', description)  # Range markers
-    description = re.sub(r'\s*\d+/\d+\s*$', '', description)           # Single marker at end
-    return re.sub(r'\s+', ' ', description).strip()                    # Clean extra spaces
+    description = _MILE_MARKER_RANGE.sub(' ', description)  # Range markers
+    description = _MILE_MARKER_END.sub('', description)     # Single marker at end
+    return _WHITESPACE.sub(' ', description).strip()        # Clean extra spaces
 
 def analyze_directional_status(closures, direction):
     """
@@ -385,242 +1965,1453 @@ def analyze_directional_status(closures, direction):
     
     # Check for full closure
     for closure in active_closures:
-        if 'carriageway closure' in closure['description'].lower():
+        if (closure.get('severity') or closure_severity(closure['description'])) == "CLOSED":
             return "CLOSED", directional_closures
     
     return "RESTRICTED", directional_closures
 
-def get_bridge_current_status(closures):
+class ClosureTimeline:
     """
-    Determine the CURRENT STATUS of each Severn Bridge
-    Returns: dict with M4 and M48 status including directional info
+    Interval index over the [start_time, end_time] windows of Severn closures
+    
+    Boundaries are sorted once and every boundary stores the closures covering
+    it and the open segment after it, so active_at() is one binary search;
+    changes_between() and next_change() bisect the sorted start/end events.
+    Suspended closures are left out and closures without both times are kept
+    in `undated`.
     """
-    m4_status = {"bridge": "M4 Prince of Wales Bridge", "status": "OPEN", "closures": [], 
-                 "eastbound": "OPEN", "westbound": "OPEN"}
-    m48_status = {"bridge": "M48 Severn Bridge", "status": "OPEN", "closures": [],
-                  "eastbound": "OPEN", "westbound": "OPEN"}
     
-    for closure in closures:
-        if check_severn_bridge(closure):
-            is_active, reason = is_currently_active(closure)
-            
-            closure_info = {
-                'location': closure['location'],
-                'description': clean_description(closure['description']),
-                'is_active': is_active,
-                'reason': reason,
-                'status': closure['status'],
-                'probability': closure['probability'],
-                'cause': closure['cause'],
-                'start': closure['start'],
-                'end': closure['end'],
-                'direction': closure.get('direction', 'unknown')
-            }
-            
-            # Categorize by bridge
-            if 'M48' in closure['road'] or 'M48' in closure['location']:
-                m48_status['closures'].append(closure_info)
-                if is_active:
-                    m48_status['status'] = "CLOSED" if 'carriageway closure' in closure['description'].lower() else "RESTRICTED"
-            elif 'M4' in closure['road'] or 'M4' in closure['location']:
-                m4_status['closures'].append(closure_info)
-                if is_active:
-                    m4_status['status'] = "CLOSED" if 'carriageway closure' in closure['description'].lower() else "RESTRICTED"
+    def __init__(self, closures):
+        self.undated = []
+        events = []  # (time, kind, closure); starts sort before ends at the same instant
+        for closure in closures:
+            if not is_severn_closure(closure) or closure.status.lower() == 'suspended':
+                continue
+            start_time, end_time = closure.start_time, closure.end_time
+            if start_time and end_time and start_time <= end_time:
+                events.append((start_time, 'start', closure))
+                events.append((end_time, 'end', closure))
+            else:
+                self.undated.append(closure)
+        events.sort(key=lambda event: (event[0], event[1] == 'end'))
+        self._events = events
+        self._event_times = [event[0] for event in events]
+        
+        # Sweep the events once, recording who is active at and just after each boundary
+        self._boundaries = []
+        self._at_boundary = []
+        self._after_boundary = []
+        active = {}
+        i = 0
+        while i < len(events):
+            boundary = events[i][0]
+            ending = []
+            while i < len(events) and events[i][0] == boundary:
+                _, kind, closure = events[i]
+                if kind == 'start':
+                    active[id(closure)] = closure
+                else:
+                    ending.append(closure)
+                i += 1
+            self._boundaries.append(boundary)
+            self._at_boundary.append(tuple(active.values()))
+            for closure in ending:
+                del active[id(closure)]
+            self._after_boundary.append(tuple(active.values()))
+    
+    def active_at(self, when):
+        """Closures whose window contains `when` (windows are inclusive at both ends)"""
+        i = bisect_right(self._boundaries, when) - 1
+        if i < 0:
+            return ()
+        return self._at_boundary[i] if self._boundaries[i] == when else self._after_boundary[i]
+    
+    def changes_between(self, start, end=None):
+        """(time, 'start'|'end', closure) for every window boundary in [start, end], in time order"""
+        lo = bisect_left(self._event_times, start)
+        hi = bisect_right(self._event_times, end) if end is not None else len(self._events)
+        return self._events[lo:hi]
+    
+    def starting_between(self, start, end=None):
+        """Closures whose window starts in [start, end], by start time"""
+        return [closure for _, kind, closure in self.changes_between(start, end) if kind == 'start']
+    
+    def next_change(self, after):
+        """(time, [(kind, closure), ...]) for the first boundary strictly after `after`, or None"""
+        i = bisect_right(self._boundaries, after)
+        if i == len(self._boundaries):
+            return None
+        boundary = self._boundaries[i]
+        return boundary, [(kind, closure) for _, kind, closure in self.changes_between(boundary, boundary)]
+
+def get_timeline(closures):
+    """ClosureTimeline for a closures list, reused while the same list is current (e.g. across 304s)"""
+    if _timeline_cache['closures'] is not closures:
+        _timeline_cache['timeline'] = ClosureTimeline(closures)
+        _timeline_cache['closures'] = closures
+    return _timeline_cache['timeline']
+
+def get_corridor_status(closures, name, now=None):
+    """
+    Determine the CURRENT STATUS of each road of a corridor (or its status at `now`, see is_currently_active)
+    Returns: dict road -> status with the road's title as 'bridge', overall 'status',
+    its 'closures' and one key per corridor direction (e.g. 'eastbound')
+    """
+    started = time.perf_counter()
+    titles = _corridor_titles(name)
+    directions = CORRIDORS[name]['directions']
+    statuses = {road: dict({"bridge": title, "status": "OPEN", "closures": []},
+                           **{direction.lower(): "OPEN" for direction in directions})
+                for road, title in titles.items()}
+    
+    for closure in closures_by_corridor(closures)[name]:
+        classification = classify_closure(closure)
+        road_status = statuses.get(_corridor_road(closure, titles))
+        if road_status is None:
+            continue
+        is_active, reason = is_currently_active(closure, now)
+        
+        closure_info = {
+            'location': closure.location,
+            'description': classification['description'],
+            'is_active': is_active,
+            'reason': reason,
+            'status': closure.status,
+            'probability': closure.probability,
+            'cause': closure.cause,
+            'start': closure.start,
+            'end': closure.end,
+            'start_time': closure.start_time,
+            'end_time': closure.end_time,
+            'direction': closure.direction,
+            'junction': classification['junction'],
+            'severity': classification['severity']
+        }
+        road_status['closures'].append(closure_info)
+        if is_active:
+            road_status['status'] = classification['severity']
     
     # Analyze directional status
-    m48_east_status, _ = analyze_directional_status(m48_status['closures'], 'eastBound')
-    m48_west_status, _ = analyze_directional_status(m48_status['closures'], 'westBound')
-    m48_status['eastbound'] = m48_east_status
-    m48_status['westbound'] = m48_west_status
+    for road_status in statuses.values():
+        for direction in directions:
+            road_status[direction.lower()], _ = analyze_directional_status(road_status['closures'], direction)
     
-    m4_east_status, _ = analyze_directional_status(m4_status['closures'], 'eastBound')
-    m4_west_status, _ = analyze_directional_status(m4_status['closures'], 'westBound')
-    m4_status['eastbound'] = m4_east_status
-    m4_status['westbound'] = m4_west_status
+    record_stage('status', time.perf_counter() - started)
+    return statuses
+
+def get_bridge_current_status(closures, now=None):
+    """
+    Determine the CURRENT STATUS of each Severn Bridge (or its status at `now`, see is_currently_active)
+    Returns: dict with M4 and M48 status including directional info
+    """
+    statuses = get_corridor_status(closures, 'severn', now)
+    return statuses['M4'], statuses['M48']
+
+def _timed(fetch):
+    """Run a fetch function and return (result, elapsed seconds)"""
+    started = time.monotonic()
+    result = fetch()
+    return result, time.monotonic() - started
+
+def _await_fetch(future, deadline, name):
+    """Wait for a fetch future until the shared deadline; returns (result, seconds) or (None, None)"""
+    from concurrent.futures import TimeoutError as FuturesTimeout
+    try:
+        return future.result(timeout=max(0, deadline - time.monotonic()))
+    except FuturesTimeout:
+        _log(f"✗ {name} fetch missed the {FETCH_DEADLINE}s deadline")
+        return None, None
+
+def fetch_all(closures_max_age=CLOSURES_CACHE_DURATION, on_weather=None, revalidate_in_background=True):
+    """
+    Fetch weather and closures concurrently under one deadline
+    on_weather(weather) is called as soon as the weather arrives, before waiting on closures.
+    With revalidate_in_background=False, outdated caches are refreshed before returning
+    (the daemon's choice) rather than served while a background refresh runs. A fetch
+    that fails or misses the deadline falls back to the last good data, if any.
+    Returns: (weather per bridge from parse_bridge_weather or None, closures or None,
+    the closures' content hash, see fetch_closures_snapshot)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    closures_swr = CLOSURES_STALE_WHILE_REVALIDATE if revalidate_in_background else 0
+    weather_swr = WEATHER_STALE_WHILE_REVALIDATE if revalidate_in_background else 0
+    # Start both upstream requests at once; wall time is the slower of the two, not the sum
+    started = time.monotonic()
+    deadline = started + FETCH_DEADLINE
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='fetch')
+    weather_future = pool.submit(_timed, lambda: fetch_weather(weather_swr))
+    closures_future = pool.submit(_timed, lambda: fetch_closures_snapshot(closures_max_age, closures_swr))  # one streaming pass
+    pool.shutdown(wait=False)
     
-    return m4_status, m48_status
+    weather_data, weather_secs = _await_fetch(weather_future, deadline, "Weather")
+    if weather_secs is None:
+        weather_data = {road: _weather_cache[(bridge['latitude'], bridge['longitude'])]['data']
+                        for road, bridge in BRIDGES.items()
+                        if (bridge['latitude'], bridge['longitude']) in _weather_cache} or None
+    weather = parse_bridge_weather(weather_data)
+    if on_weather is not None:
+        on_weather(weather)
+    
+    closures_result, closures_secs = _await_fetch(closures_future, deadline, "Closures")
+    closures, closures_hash = closures_result or (None, None)
+    if closures_secs is None and _cache['data'] is not None:
+        _log(f"Serving last good closures ({_format_age(closures_age())} old)")
+        count('closures_stale_served')
+        closures, closures_hash = _cached_closures()
+    timings = [f"{name} {secs:.2f}s" for name, secs in
+               (("weather", weather_secs), ("closures", closures_secs)) if secs is not None]
+    _log(f"Fetch timings: {', '.join(timings) or 'none completed'} "
+          f"(total {time.monotonic() - started:.2f}s)")
+    return weather, closures, closures_hash
 
-def main():
-    print("=" * 70)
-    print("🌉 SEVERN BRIDGES - CURRENT STATUS")
-    print("=" * 70)
+def upcoming_closures(closures, now=None):
+    """Planned Severn closures that haven't started yet, by start time, then planned closures without dates"""
+    timeline = get_timeline(closures)
+    upcoming = [closure for closure in timeline.starting_between(now or datetime.now(timezone.utc))
+                if closure.status.lower() == 'planned']
+    return upcoming + [closure for closure in timeline.undated if closure.status.lower() == 'planned']
+
+def status_model(weather, closures, m4_status, m48_status, now=None):
+    """
+    The status run's output, computed once for every --format
+    Returns: dict with 'time', 'closures_as_of', 'bridges' (m4/m48 from get_bridge_current_status,
+    None if closures failed), 'weather' (from parse_bridge_weather) and 'upcoming' planned closures
+    """
+    now = now or datetime.now(timezone.utc)
+    upcoming = []
+    for closure in upcoming_closures(closures, now) if closures is not None else ():
+        upcoming.append({
+            'road': closure.road,
+            'location': closure.location,
+            'direction': closure.direction,
+            'description': classify_closure(closure)['description'],
+            'situation_id': closure.situation_id,
+            'start': closure.start,
+            'end': closure.end,
+            'start_time': closure.start_time,
+            'end_time': closure.end_time,
+        })
+    return {
+        'time': now,
+        'closures_as_of': _cache['timestamp'] if closures is not None else None,
+        'bridges': {'m4': m4_status, 'm48': m48_status} if closures is not None else None,
+        'weather': weather,
+        'upcoming': upcoming,
+    }
+
+def _status_symbol(status):
+    return "🟢" if status == "OPEN" else "🔴" if status == "CLOSED" else "🟡"
+
+def _format_time(when):
+    return when.strftime('%Y-%m-%d %H:%M %Z')
+
+OUTPUT_FORMATS = ('text', 'json', 'ndjson')
+
+# Text output: headings per bridge and the prefix for a closure's direction
+BRIDGE_HEADINGS = {
+    'm48': "M48 SEVERN BRIDGE (Original Bridge, 1966)",
+    'm4': "M4 PRINCE OF WALES BRIDGE (Second Severn Crossing, 1996)",
+}
+DIRECTION_PREFIXES = {'eastbound': "→ Eastbound: ", 'westbound': "← Westbound: ",
+                      'bothdirections': "↔️ Both directions: "}
+
+def _render_bridge(lines, heading, status):
+    """Append one bridge's block (overall, per direction and its closures) to lines"""
+    lines.append(f"{_status_symbol(status['status'])} {heading}")
+    lines.append(f"   Overall Status: {status['status']}")
+    lines.append(f"   → Eastbound (Wales → England): {_status_symbol(status['eastbound'])} {status['eastbound']}")
+    lines.append(f"   ← Westbound (England → Wales): {_status_symbol(status['westbound'])} {status['westbound']}")
+    if not status['closures']:
+        lines.append("   ✓ No closures or restrictions")
+    for closure in status['closures']:
+        if closure['is_active']:
+            prefix = DIRECTION_PREFIXES.get((closure.get('direction') or '').lower(), "")
+            lines.append(f"   ⚠️  ACTIVE CLOSURE - {prefix}{closure['location']}")
+            lines.append(f"      {closure['description']}")
+            lines.append(f"      Reason: {closure['reason']}")
+            lines.append(f"      Cause: {closure['cause']}")
+        else:
+            lines.append(f"   ℹ️  Planned: {closure['description']}")
+            lines.append(f"      {closure['reason']}")
+        if closure['start_time']:
+            lines.append(f"      From: {_format_time(closure['start_time'])}")
+        if closure['end_time']:
+            lines.append(f"      Until: {_format_time(closure['end_time'])}")
+
+def render_text(model):
+    """The status section of the text output (current status, upcoming closures, notes) as one string"""
+    lines = ["=" * 70, "⚠️  CURRENT STATUS - RIGHT NOW", "=" * 70, ""]
+    for key in ('m48', 'm4'):
+        _render_bridge(lines, BRIDGE_HEADINGS[key], model['bridges'][key])
+        lines.append("")
+    
+    lines += ["=" * 70, "📅 UPCOMING PLANNED CLOSURES (Severn Bridge Area)", "=" * 70]
+    for idx, closure in enumerate(model['upcoming'], 1):
+        lines += ["", f"{idx}. {closure['road']} - {closure['location']}", f"   {closure['description']}"]
+        if closure['start_time'] or closure['start']:
+            lines.append(f"   Starts: {_format_time(closure['start_time']) if closure['start_time'] else closure['start']}")
+        if closure['end_time'] or closure['end']:
+            lines.append(f"   Ends: {_format_time(closure['end_time']) if closure['end_time'] else closure['end']}")
+    if not model['upcoming']:
+        lines += ["", "✓ No upcoming planned closures"]
+    
+    lines += ["", "=" * 70,
+              "ℹ️  NOTES:",
+              "   • 'active' status = closure confirmed by operator",
+              "   • 'planned' status = scheduled closure, may not have started yet",
+              "   • Ad-hoc closures (e.g., high winds) appear with 'active' status",
+              "   • Check 'cause' field for reason (e.g., poorEnvironment for weather)",
+              "   • Weather data updates every 30 minutes",
+              "=" * 70]
+    return "\n".join(lines) + "\n"
+
+def render_json(model, output_format='json'):
+    """The model as one JSON document (indented), or one compact NDJSON line for 'ndjson'"""
+    if output_format == 'ndjson':
+        return json.dumps(model, separators=(',', ':'), default=_json_default) + "\n"
+    return json.dumps(model, indent=2, default=_json_default) + "\n"
+
+def run_once(closures_max_age=CLOSURES_CACHE_DURATION, revalidate_in_background=True, output_format='text',
+             output=None):
+    """
+    Fetch, analyse and display the current status once (revalidate_in_background: see fetch_all)
+    output_format 'json' or 'ndjson' writes status_model() to output (default sys.stdout) in
+    one write instead of the text report; progress messages still go to sys.stdout.
+    Returns: (weather, closures, m4_status, m48_status, closures' content hash);
+    all but weather are None if closures failed
+    """
+    output = output or sys.stdout
+    text = output_format == 'text'
     now = datetime.now(timezone.utc)
-    local_now = datetime.now()
-    print(f"Current time: {local_now.strftime('%Y-%m-%d %H:%M:%S')} (Local)")
-    print(f"              {now.strftime('%Y-%m-%d %H:%M:%S')} (UTC)")
-    print()
+    if text:
+        output.write("\n".join(["=" * 70, "🌉 SEVERN BRIDGES - CURRENT STATUS", "=" * 70,
+                                 f"Current time: {now.astimezone().strftime('%Y-%m-%d %H:%M:%S')} (Local)",
+                                 f"              {now.strftime('%Y-%m-%d %H:%M:%S')} (UTC)", "", ""]))
     
-    # Fetch and display weather FIRST
-    weather_data = fetch_weather()
-    weather = parse_weather_data(weather_data) if weather_data else None
-    print()
-    display_weather(weather)
+    # Display weather FIRST, as soon as it arrives
+    def show_weather(weather):
+        with stage_timer('render'), _print_lock:
+            output.write("\n" + render_weather(weather))
     
-    # Fetch data
-    xml_data = fetch_closures()
-    if not xml_data:
-        print("❌ Failed to fetch data")
+    weather, closures, closures_hash = fetch_all(closures_max_age, on_weather=show_weather if text else None,
+                                  revalidate_in_background=revalidate_in_background)
+    m4_status = m48_status = None
+    if closures is None:
+        _log("❌ Failed to fetch data")
+    else:
+        _log("")
+        age = closures_age()
+        if age is not None and age >= max(closures_max_age, CLOSURES_CACHE_DURATION):
+            _log(f"⚠️  Showing closures as of {_cache['timestamp'].astimezone().strftime('%Y-%m-%d %H:%M')} "
+                  f"({_format_age(age)} old)")
+        
+        severn_roads = _corridor_keywords('severn')
+        _log(f"Found {sum(closure.road in severn_roads for closure in closures)} M4/M48 closures\n")
+        
+        # Get current status of both bridges
+        m4_status, m48_status = get_bridge_current_status(closures)
+    
+    if text and closures is None:
+        return weather, None, None, None, None
+    with stage_timer('render'), _print_lock:
+        model = status_model(weather, closures, m4_status, m48_status, now)
+        output.write(render_text(model) if text else render_json(model, output_format))
+        output.flush()
+    return weather, closures, m4_status, m48_status, closures_hash
+
+def next_poll_interval(weather, closures, bridge_statuses, now=None):
+    """
+    Pick the daemon's next poll interval from how likely a status change is
+    Returns: (seconds, reason)
+    """
+    now = now or datetime.now(timezone.utc)
+    
+    # Seconds until the nearest upcoming start/end of a Severn closure
+    next_change = get_timeline(closures).next_change(now) if closures else None
+    next_boundary = (next_change[0] - now).total_seconds() if next_change else None
+    
+    risks = [get_wind_risk_level(bridge_weather[key])[0] for bridge_weather in (weather or {}).values()
+             for key in ('wind_speed_mph', 'max_gust_mph')]
+    all_open = bool(bridge_statuses) and all(status['status'] == "OPEN" for status in bridge_statuses)
+    
+    if any(risk.startswith(('HIGH RISK', 'MONITOR')) for risk in risks):
+        interval, reason = POLL_INTERVAL_FAST, "wind risk elevated"
+    elif next_boundary is not None and next_boundary <= CLOSURE_BOUNDARY_WINDOW:
+        interval, reason = POLL_INTERVAL_FAST, "planned closure starting/ending soon"
+    elif (now.astimezone().hour in QUIET_HOURS and all_open and risks
+          and all(risk == 'Safe' for risk in risks)):
+        interval, reason = POLL_INTERVAL_RELAXED, "overnight, all Safe and OPEN"
+    else:
+        interval, reason = POLL_INTERVAL_NORMAL, "normal"
+    
+    # Wake up for the next closure boundary even if the schedule would sleep through it
+    if next_boundary is not None and next_boundary < interval:
+        interval, reason = max(int(next_boundary) + 1, POLL_INTERVAL_MIN), "closure boundary"
+    return interval, reason
+
+def add_change_listener(listener):
+    """Register listener(events) to be called with each poll's non-empty list of ChangeEvents"""
+    _change_listeners.append(listener)
+
+def detect_changes(closures, bridge_statuses, weather=None):
+    """
+    Diff this poll against the previous one and notify change listeners
+    
+    Severn closures are compared by situation fingerprint (id + version), so only
+    added, changed and removed situations produce events; bridge status is
+    compared overall and per direction. With weather (from parse_bridge_weather),
+    each bridge's current wind and today's max gust produce an event when they
+    cross WIND_HIGH_RISK_MPH. The first poll just sets the baseline.
+    Returns: list of ChangeEvent
+    """
+    situations = {}
+    for closure in closures:
+        if is_severn_closure(closure):
+            key = closure.situation_id or (closure.road, closure.location, closure.start)
+            situations.setdefault(key, []).append(closure)
+    
+    statuses = {}
+    for status in bridge_statuses:
+        road = status['bridge'].split()[0]
+        for direction in ('overall', 'eastbound', 'westbound'):
+            statuses[(road, direction)] = status['status' if direction == 'overall' else direction]
+    
+    # Risk level names ('HIGH RISK', 'MONITOR', 'Safe') per bridge and measurement
+    wind = {(road, measurement): get_wind_risk_level(reading[key])[0].split(' - ')[0]
+            for road, reading in (weather or {}).items() if reading
+            for measurement, key in (('wind', 'wind_speed_mph'), ('gusts', 'max_gust_mph'))
+            if reading[key] is not None}
+    
+    previous_situations, previous_statuses = _previous_poll['situations'], _previous_poll['statuses']
+    previous_wind = _previous_poll['wind'] or {}
+    _previous_poll['situations'], _previous_poll['statuses'] = situations, statuses
+    if weather is not None:
+        _previous_poll['wind'] = wind
+    if previous_situations is None:
+        return []
+    
+    events = []
+    for key, current in situations.items():
+        previous = previous_situations.get(key)
+        if previous is None:
+            events.extend(ChangeEvent(EVENT_CLOSURE_ADDED, c.road, c.direction, None, c.version, c)
+                          for c in current)
+        elif previous[0].version != current[0].version:
+            events.extend(ChangeEvent(EVENT_CLOSURE_CHANGED, c.road, c.direction,
+                                      previous[0].version, c.version, c) for c in current)
+    for key, previous in previous_situations.items():
+        if key not in situations:
+            events.extend(ChangeEvent(EVENT_CLOSURE_REMOVED, c.road, c.direction, c.version, None, c)
+                          for c in previous)
+    
+    for (road, direction), new in statuses.items():
+        old = previous_statuses.get((road, direction))
+        if old is not None and old != new:
+            events.append(ChangeEvent(EVENT_STATUS_CHANGED, road, direction, old, new, None))
+    
+    for (road, measurement), new in wind.items():
+        old = previous_wind.get((road, measurement))
+        if old is not None and (old == 'HIGH RISK') != (new == 'HIGH RISK'):
+            events.append(ChangeEvent(EVENT_WIND_RISK_CHANGED, road, measurement, old, new, None))
+    
+    if events:
+        for listener in _change_listeners:
+            listener(events)
+    return events
+
+def describe_event(event):
+    """One-line human readable form of a ChangeEvent"""
+    if event.kind == EVENT_STATUS_CHANGED:
+        where = event.road if event.direction == 'overall' else f"{event.road} {event.direction}"
+        return f"{where} went {event.old}→{event.new}"
+    if event.kind == EVENT_WIND_RISK_CHANGED:
+        what = 'wind' if event.direction == 'wind' else "today's gusts"
+        return f"{event.road} {what} went {event.old}→{event.new} ({WIND_HIGH_RISK_MPH} mph threshold)"
+    verb = {EVENT_CLOSURE_ADDED: 'added', EVENT_CLOSURE_CHANGED: 'updated', EVENT_CLOSURE_REMOVED: 'removed'}[event.kind]
+    closure = event.closure
+    return f"{closure.status} closure {verb}: {closure.road} {closure.direction} - {closure.location}"
+
+def event_payload(event):
+    """JSON-ready dict for a ChangeEvent (closure events carry the closure's situation and location)"""
+    payload = {'kind': event.kind, 'road': event.road, 'direction': event.direction,
+               'old': event.old, 'new': event.new, 'text': describe_event(event)}
+    if event.closure is not None:
+        payload['situation_id'] = event.closure.situation_id
+        payload['location'] = event.closure.location
+    return payload
+
+def _notification_body(events):
+    return json.dumps({'sent_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                       'events': [event_payload(event) for event in events]}).encode()
+
+def webhook_sender(url):
+    """send(events) POSTing them as JSON to url; an HTTP error status raises"""
+    import http.client
+    from urllib.parse import urlsplit
+    parts = urlsplit(url)
+    path = (parts.path or '/') + ('?' + parts.query if parts.query else '')
+    
+    def send(events):
+        body = _notification_body(events)
+        if parts.scheme == 'https':
+            conn = http.client.HTTPSConnection(parts.netloc, timeout=NOTIFY_TIMEOUT, context=_ssl_context())
+        else:
+            conn = http.client.HTTPConnection(parts.netloc, timeout=NOTIFY_TIMEOUT)
+        try:
+            conn.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+        finally:
+            conn.close()
+        if response.status >= 300:
+            raise OSError(f"webhook answered {response.status} {response.reason}")
+    return send
+
+def email_sender(recipients):
+    """send(events) mailing one message listing them to recipients, through SMTP_HOST:SMTP_PORT"""
+    def send(events):
+        import smtplib
+        from email.message import EmailMessage
+        message = EmailMessage()
+        message['From'] = SMTP_FROM
+        message['To'] = ', '.join(recipients)
+        more = f" (+{len(events) - 1} more)" if len(events) > 1 else ""
+        message['Subject'] = f"Severn bridges: {describe_event(events[0])}{more}"
+        message.set_content('\n'.join(describe_event(event) for event in events) + '\n')
+        with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=NOTIFY_TIMEOUT) as smtp:
+            smtp.send_message(message)
+    return send
+
+def unix_socket_sender(path):
+    """send(events) writing them as one JSON line to a Unix stream socket"""
+    def send(events):
+        import socket
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(NOTIFY_TIMEOUT)
+            sock.connect(path)
+            sock.sendall(_notification_body(events) + b'\n')
+    return send
+
+def sender_for(target):
+    """A send(events) function for a --notify target: http(s)://URL, mailto:ADDRESS[,ADDRESS] or unix:PATH"""
+    if target.startswith(('http://', 'https://')):
+        return webhook_sender(target)
+    if target.startswith('mailto:'):
+        recipients = [address.strip() for address in target[len('mailto:'):].split(',') if address.strip()]
+        if recipients:
+            return email_sender(recipients)
+    elif target.startswith('unix:') and len(target) > len('unix:'):
+        return unix_socket_sender(target[len('unix:'):])
+    raise ValueError(f"unsupported notification target {target!r} (use http(s)://, mailto: or unix:)")
+
+def _same_notified_state(kind, a, b):
+    """Whether two values of an event's subject count as the same for notifications"""
+    if kind == EVENT_WIND_RISK_CHANGED:
+        return (a == 'HIGH RISK') == (b == 'HIGH RISK')  # only the high-risk threshold matters
+    return a == b
+
+class Subscriber:
+    """
+    One notification target with its own delivery thread
+    
+    offer() never blocks on delivery: it merges each event into the pending
+    changes, one per (kind, road, direction) keeping the first old and the
+    latest new value, so a flapping status occupies one slot however often it
+    flips. At most queue_size changes wait; a new one beyond that evicts the
+    oldest pending change, so the latest state of things is what gets sent. The
+    first pending change opens a batch window; when it closes, the thread sends
+    the changes that still differ from what was last sent for their key (a flap
+    that ended where it started is dropped). A key sent within the last
+    key_cooldown seconds waits out the cool-down, still coalescing, first.
+    """
+    
+    def __init__(self, name, send, kinds=NOTIFY_EVENT_KINDS, batch_seconds=NOTIFY_BATCH_SECONDS,
+                 key_cooldown=NOTIFY_KEY_COOLDOWN, queue_size=NOTIFY_QUEUE_SIZE):
+        self.name = name
+        self.send = send
+        self.kinds = kinds
+        self.batch_seconds = batch_seconds
+        self.key_cooldown = key_cooldown
+        self.queue_size = queue_size
+        self._pending = {}    # key -> [first old value, latest event, monotonic time it may be sent]
+        self._last_sent = {}  # key -> (value sent, monotonic time)
+        self._window = None   # when the open batch window closes
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name=f'notify-{name}', daemon=True)
+        self._thread.start()
+    
+    def offer(self, events):
+        """Merge the events this subscriber wants into its pending changes without waiting"""
+        with self._condition:
+            now = time.monotonic()
+            for event in events:
+                if event.kind not in self.kinds:
+                    continue
+                key = (event.kind, event.road, event.direction)
+                entry = self._pending.get(key)
+                if entry is not None:
+                    entry[1] = event
+                    count('notify_coalesced')
+                    continue
+                if len(self._pending) >= self.queue_size:
+                    del self._pending[next(iter(self._pending))]  # insertion order: the oldest first
+                    count('notify_dropped')
+                if self._window is None or self._window <= now:
+                    self._window = now + self.batch_seconds
+                sent_at = self._last_sent.get(key, (None, -math.inf))[1]
+                self._pending[key] = [event.old, event, max(self._window, sent_at + self.key_cooldown)]
+            self._condition.notify()
+    
+    def close(self, timeout=None):
+        """Send whatever is pending now and stop the thread (waiting up to timeout seconds)"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join(timeout)
+    
+    def _next_batch(self):
+        """Wait for changes that are due; returns (events to send, stop after sending)"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                due = [key for key, entry in self._pending.items() if self._stopping or entry[2] <= now]
+                if due or self._stopping:
+                    break
+                timeout = min(entry[2] for entry in self._pending.values()) - now if self._pending else None
+                self._condition.wait(timeout)
+            batch = []
+            for key in due:
+                first_old, event, _ = self._pending.pop(key)
+                previous = self._last_sent.get(key, (first_old,))[0]
+                if _same_notified_state(event.kind, event.new, previous):
+                    count('notify_suppressed')  # flapped back, or already sent
+                else:
+                    batch.append(event._replace(old=previous))
+            return batch, self._stopping
+    
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if batch and self._deliver(batch):
+                with self._condition:
+                    now = time.monotonic()
+                    for event in batch:
+                        self._last_sent[(event.kind, event.road, event.direction)] = (event.new, now)
+    
+    def _deliver(self, events):
+        """send() with jittered retries; returns True once delivered"""
+        import random
+        for attempt in range(NOTIFY_RETRIES + 1):
+            if attempt:
+                time.sleep(random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1))))
+            try:
+                self.send(events)
+                count('notify_sent', len(events))
+                return True
+            except Exception as e:
+                error = e
+        count('notify_failures')
+        _log(f"✗ Notification to {self.name} failed: {error}")
+        return False
+
+def add_subscriber(target, **options):
+    """
+    Push status/wind changes to target (see sender_for) from now on; options go to Subscriber
+    Returns the Subscriber
+    """
+    subscriber = Subscriber(target, sender_for(target), **options)
+    if not _subscribers:
+        add_change_listener(_dispatch_notifications)
+    _subscribers.append(subscriber)
+    return subscriber
+
+def _dispatch_notifications(events):
+    for subscriber in _subscribers:
+        subscriber.offer(events)
+
+def close_subscribers(timeout=NOTIFY_TIMEOUT):
+    """Flush pending notifications on shutdown, giving each subscriber up to timeout seconds"""
+    for subscriber in _subscribers:
+        subscriber.close(timeout)
+
+def _json_default(value):
+    """json.dumps hook for the datetimes carried by closure records"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def publish_snapshot(weather, m4_status, m48_status, max_age):
+    """
+    Serialise the status model once for all API clients
+    The body and ETag are only replaced when the content changes, so clients'
+    If-None-Match keeps matching across polls that found nothing new.
+    """
+    import hashlib
+    model = {'bridges': {'m4': m4_status, 'm48': m48_status}, 'weather': weather}
+    content = json.dumps(model, sort_keys=True, separators=(',', ':'), default=_json_default)
+    etag = '"' + hashlib.md5(content.encode()).hexdigest() + '"'
+    with _snapshot_lock:
+        if etag != _snapshot['etag']:
+            updated = datetime.now(timezone.utc).isoformat(timespec='seconds')
+            _snapshot['body'] = json.dumps(dict(model, updated=updated), separators=(',', ':'),
+                                           default=_json_default).encode()
+            _snapshot['etag'] = etag
+            _snapshot['updated'] = updated
+        _snapshot['expires'] = time.monotonic() + max_age
+        # When the feed was last fetched or revalidated (a fallback to old data keeps the old time)
+        _snapshot['as_of'] = _cache['timestamp'].timestamp() if _cache['timestamp'] else None
+
+class StatusRequestHandler:
+    """
+    Serve the pre-serialised snapshot from memory; a matching If-None-Match gets a bodiless 304
+    Mixed into http.server.BaseHTTPRequestHandler by start_status_server(), so
+    http.server is only imported when a server is started.
+    """
+    protocol_version = 'HTTP/1.1'
+    server_version = 'SevernBridgeMonitor/0.1'
+    
+    def do_GET(self):
+        self._send_snapshot(include_body=True)
+    
+    def do_HEAD(self):
+        self._send_snapshot(include_body=False)
+    
+    def _send_snapshot(self, include_body):
+        path = self.path.split('?', 1)[0]
+        if path == '/metrics':
+            self._send_metrics(include_body)
+            return
+        if path not in ('/', '/status'):
+            self._send_empty(404)
+            return
+        
+        with _snapshot_lock:
+            body, etag, expires, as_of = _snapshot['body'], _snapshot['etag'], _snapshot['expires'], _snapshot['as_of']
+        if body is None:
+            self._send_empty(503, {'Retry-After': '5'})
+            return
+        
+        # Clients may reuse the snapshot until the next upstream poll is due; Age says how
+        # old the closures data is, so a client can tell when an upstream outage left it stale
+        headers = {'ETag': etag, 'Cache-Control': f"public, max-age={max(int(expires - time.monotonic()), 0)}"}
+        if as_of is not None:
+            headers['Age'] = str(max(int(time.time() - as_of), 0))
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and (if_none_match.strip() == '*' or
+                              etag in (tag.strip() for tag in if_none_match.split(','))):
+            self._send_empty(304, headers)
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+    
+    def _send_metrics(self, include_body):
+        body = format_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+    
+    def _send_empty(self, status, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        pass  # one line per client poll would drown out the poll log
+
+def start_status_server(host, port):
+    """Start the status API on a background thread; returns the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    handler = type('StatusRequestHandler', (StatusRequestHandler, BaseHTTPRequestHandler), {})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='status-api', daemon=True).start()
+    print(f"🌐 Serving bridge status on http://{host}:{server.server_port}/status (metrics on /metrics)")
+    return server
+
+def _status_code(value, names):
+    return names.index(value) if value in names else 0
+
+def publish_status_file(m4_status, m48_status, weather, closures, path=None):
+    """
+    Write the bridges' status, wind risk and next planned closure to the shared status file
+    The layout lives in bridge_status.py. The generation counter is made odd for the
+    duration of the write (a seqlock), and a file lock keeps concurrent writers apart.
+    """
+    import mmap
+    import bridge_status as layout
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None  # no advisory locks (Windows): concurrent writers are not expected there
+    path = STATUS_FILE if path is None else path
+    if not path:
         return
     
-    print()
+    body = bytearray(layout.FILE_SIZE - layout.HEADER.size)
+    for slot, (road, status) in enumerate((('M48', m48_status), ('M4', m4_status))):
+        reading = (weather or {}).get(road) or {}
+        wind_mph, gust_mph = reading.get('wind_speed_mph'), reading.get('max_gust_mph')
+        risks = [_status_code(get_wind_risk_level(mph)[0].split(' - ')[0], layout.RISKS) for mph in (wind_mph, gust_mph)]
+        layout.BRIDGE.pack_into(body, slot * layout.BRIDGE.size, road.encode(),
+                                *(_status_code(status[key], layout.STATUSES)
+                                  for key in ('status', 'eastbound', 'westbound')),
+                                *risks, wind_mph or 0.0, gust_mph or 0.0)
     
-    # Parse closures
-    closures = parse_xml_closures(xml_data)
-    print(f"Found {len(closures)} M4/M48 closures\n")
+    now = datetime.now(timezone.utc)
+    upcoming = [closure for closure in get_timeline(closures).starting_between(now)
+                if closure.status.lower() == 'planned']
+    if upcoming:
+        closure = upcoming[0]
+        location = closure.location.encode()[:96].decode('utf-8', 'ignore').encode()  # whole characters only
+        layout.NEXT_CLOSURE.pack_into(body, layout.BRIDGE_SLOTS * layout.BRIDGE.size,
+                                      closure.start_time.timestamp(),
+                                      closure.end_time.timestamp() if closure.end_time else 0.0,
+                                      closure.road.encode(), (closure.direction or '').encode(), location)
+    as_of = _cache['timestamp'].timestamp() if _cache['timestamp'] else 0.0
     
-    # Get current status of both bridges
-    m4_status, m48_status = get_bridge_current_status(closures)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError as e:
+        print(f"✗ Could not write status file: {e}")
+        return
+    try:
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_EX)
+        if os.fstat(fd).st_size < layout.FILE_SIZE:
+            os.ftruncate(fd, layout.FILE_SIZE)
+        with mmap.mmap(fd, layout.FILE_SIZE) as view:
+            generation = layout.GENERATION.unpack_from(view, layout.GENERATION_OFFSET)[0]
+            generation += generation % 2 == 0  # odd: write in progress (already odd if a writer died mid-write)
+            layout.set_generation(view, generation)
+            view[layout.HEADER.size:layout.FILE_SIZE] = body
+            # The rest of the header, around the counter (packing the whole header would clear it)
+            layout.HEADER_PREFIX.pack_into(view, 0, layout.MAGIC, layout.LAYOUT_VERSION, layout.BRIDGE_SLOTS)
+            layout.HEADER_TIMES.pack_into(view, layout.HEADER_TIMES_OFFSET, time.time(), as_of)
+            layout.set_generation(view, generation + 1)
+    except OSError as e:
+        print(f"✗ Could not write status file: {e}")
+    finally:
+        os.close(fd)
+
+def open_archive(path):
+    """Open (creating if needed) a history archive; rows come back as sqlite3.Row"""
+    import sqlite3
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(ARCHIVE_SCHEMA)
+    return conn
+
+def _epoch(when):
+    return int(when.timestamp()) if when is not None else None
+
+def _closure_fingerprint(closure):
+    """Content key of one closure version, so it is stored once however many snapshots carry it"""
+    fields = (closure.situation_id, closure.version, closure.road, closure.direction, closure.location,
+              closure.description, closure.status, closure.start, closure.end)
+    import hashlib
+    return hashlib.md5('\x1f'.join(field or '' for field in fields).encode()).hexdigest()
+
+def archive_snapshot(path, snapshot_hash, closures, weather, observed_at=None):
+    """
+    Record one run in the archive: the snapshot (stored once per content hash)
+    with its closures on corridor roads, and an observation carrying each bridge's parsed
+    weather (from parse_bridge_weather)
+    """
+    import sqlite3
+    observed = _epoch(observed_at or datetime.now(timezone.utc))
+    try:
+        conn = open_archive(path)
+    except sqlite3.Error as e:
+        print(f"✗ Could not open archive: {e}")
+        return
+    try:
+        with conn:
+            row = conn.execute('SELECT id FROM snapshots WHERE hash = ?', (snapshot_hash,)).fetchone()
+            if row is not None:
+                snapshot_id = row['id']
+                conn.execute('UPDATE snapshots SET last_seen = ? WHERE id = ?', (observed, snapshot_id))
+                previous = conn.execute('SELECT snapshot_id FROM observations ORDER BY id DESC LIMIT 1').fetchone()
+                if previous is None or previous['snapshot_id'] != snapshot_id:
+                    conn.execute(_ARCHIVE_MARK_LATEST, {'snapshot': snapshot_id})  # feed went back to it
+            else:
+                snapshot_id = conn.execute(
+                    'INSERT INTO snapshots (hash, first_seen, last_seen, closure_count) VALUES (?, ?, ?, ?)',
+                    (snapshot_hash, observed, observed, len(closures))).lastrowid
+                rows = []
+                for closure in closures:
+                    classification = classify_closure(closure)
+                    rows.append((_closure_fingerprint(closure), closure.situation_id, closure.version,
+                                 closure.road, closure.direction, closure.status, closure.cause,
+                                 closure.probability, closure.location, classification['description'],
+                                 _epoch(closure.start_time), _epoch(closure.end_time),
+                                 classification['severn'], classification['bridge'],
+                                 classification['junction'], classification['severity'], observed))
+                conn.executemany(
+                    'INSERT OR IGNORE INTO closures (fingerprint, situation_id, version, road, direction, '
+                    'status, cause, probability, location, description, start_ts, end_ts, severn, '
+                    'bridge, junction, severity, first_seen) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows)
+                conn.executemany(
+                    'INSERT OR IGNORE INTO snapshot_closures (snapshot_id, closure_id) '
+                    'SELECT ?, id FROM closures WHERE fingerprint = ?',
+                    [(snapshot_id, row[0]) for row in rows])
+                conn.execute(_ARCHIVE_MARK_LATEST, {'snapshot': snapshot_id})
+            observation_id = conn.execute('INSERT INTO observations (observed_at, snapshot_id) VALUES (?, ?)',
+                                          (observed, snapshot_id)).lastrowid
+            conn.executemany(
+                'INSERT INTO weather_readings (observation_id, bridge, temperature, wind_speed_mph, max_gust_mph, '
+                'gust_time, rain_probability, rain_time) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                [(observation_id, road, reading['temperature'], reading['wind_speed_mph'], reading['max_gust_mph'],
+                  reading['gust_time'], reading['rain_probability'], reading['rain_time'])
+                 for road, reading in (weather or {}).items() if reading])
+    except sqlite3.Error as e:
+        print(f"✗ Could not write archive: {e}")
+    finally:
+        conn.close()
+
+def query_archive_closures(path, road=None, cause=None, direction=None, since=None, until=None, severn_only=True):
+    """
+    Archived closures (latest version of each situation) whose window starts in
+    [since, until], e.g. all M48 poorEnvironment closures in the last year:
+    query_archive_closures(path, road='M48', cause='poorEnvironment', since=now - timedelta(days=365))
+    Returns: list of sqlite3.Row ordered by start time
+    """
+    conditions, params = ['latest = 1', _SEVERN_FILTER[severn_only]], []
+    for column, value in (('road', road), ('cause', cause), ('direction', direction)):
+        if value is not None:
+            conditions.append(f'{column} = ?')
+            params.append(value)
+    if since is not None:
+        conditions.append('start_ts >= ?')
+        params.append(_epoch(since))
+    if until is not None:
+        conditions.append('start_ts <= ?')
+        params.append(_epoch(until))
+    conn = open_archive(path)
+    try:
+        return conn.execute('SELECT * FROM closures WHERE ' + ' AND '.join(conditions) + ' ORDER BY start_ts',
+                            params).fetchall()
+    finally:
+        conn.close()
+
+def closure_minutes_by_month(path, since=None, severn_only=True):
+    """
+    Minutes of scheduled closure per month, road and direction, from the latest
+    version of each archived closure with a complete window
+    Suspended closures are left out, and a window running into later months is
+    split at the (UTC) month boundaries, so each month gets only its own minutes
+    and counts the closure once. With since, only the part after it counts.
+    Returns: list of (month 'YYYY-MM', road, direction, minutes, closures)
+    """
+    where = ('latest = 1 AND ' + _SEVERN_FILTER[severn_only] + ' AND end_ts >= start_ts'
+             " AND COALESCE(lower(status), '') != 'suspended'")
+    params = []
+    since_ts = _epoch(since) if since is not None else None
+    if since_ts is not None:
+        where += ' AND end_ts >= ?'
+        params.append(since_ts)
+    conn = open_archive(path)
+    try:
+        windows = conn.execute("SELECT start_ts, end_ts, road, direction FROM closures WHERE " + where, params).fetchall()
+    finally:
+        conn.close()
     
-    # Display CURRENT STATUS prominently
+    totals = {}  # (month, road, direction) -> [seconds, closures]
+    for start_ts, end_ts, road, direction in windows:
+        if since_ts is not None:
+            start_ts = max(start_ts, since_ts)
+        month = datetime.fromtimestamp(start_ts, timezone.utc).replace(day=1, hour=0, minute=0, second=0)
+        while True:
+            next_month = (month + timedelta(days=32)).replace(day=1)
+            piece_end = min(end_ts, next_month.timestamp())
+            total = totals.setdefault((month.strftime('%Y-%m'), road, direction), [0, 0])
+            total[0] += piece_end - start_ts
+            total[1] += 1
+            if piece_end >= end_ts:
+                break
+            month, start_ts = next_month, piece_end
+    return [(month, road, direction, int(seconds // 60), closures)
+            for (month, road, direction), (seconds, closures) in
+            sorted(totals.items(), key=lambda item: (item[0][0], item[0][1], item[0][2] or ''))]
+
+def print_history(path):
+    """Print closure minutes per month per bridge direction from the archive"""
+    rows = closure_minutes_by_month(path)
     print("=" * 70)
-    print("⚠️  CURRENT STATUS - RIGHT NOW")
+    print("📚 SEVERN CLOSURE HISTORY - minutes closed or restricted per month")
     print("=" * 70)
-    print()
-    
-    # M48 Status
-    status_symbol_48 = "🟢" if m48_status['status'] == "OPEN" else "🔴" if m48_status['status'] == "CLOSED" else "🟡"
-    print(f"{status_symbol_48} M48 SEVERN BRIDGE (Original Bridge, 1966)")
-    print(f"   Overall Status: {m48_status['status']}")
-    
-    # Directional Status
-    east_symbol = "🟢" if m48_status['eastbound'] == "OPEN" else "🔴" if m48_status['eastbound'] == "CLOSED" else "🟡"
-    west_symbol = "🟢" if m48_status['westbound'] == "OPEN" else "🔴" if m48_status['westbound'] == "CLOSED" else "🟡"
-    print(f"   → Eastbound (Wales → England): {east_symbol} {m48_status['eastbound']}")
-    print(f"   ← Westbound (England → Wales): {west_symbol} {m48_status['westbound']}")
-    if m48_status['closures']:
-        for closure in m48_status['closures']:
-            direction_str = ""
-            if 'direction' in closure:
-                direction = closure.get('direction', 'unknown').lower()
-                if direction == 'eastbound':
-                    direction_str = "→ Eastbound: "
-                elif direction == 'westbound':
-                    direction_str = "← Westbound: "
-                elif direction == 'bothdirections':
-                    direction_str = "↔️ Both directions: "
-            
-            if closure['is_active']:
-                print(f"   ⚠️  ACTIVE CLOSURE - {direction_str}{closure['location']}")
-                print(f"      {closure['description']}")
-                print(f"      Reason: {closure['reason']}")
-                print(f"      Cause: {closure['cause']}")
-                if closure['end']:
-                    try:
-                        end_time = datetime.fromisoformat(closure['end'].replace('Z', '+00:00'))
-                        print(f"      Until: {end_time.strftime('%Y-%m-%d %H:%M %Z')}")
-                    except:
-                        pass
+    if not rows:
+        print("\nNo archived closures yet (record some runs with --archive)")
+        return
+    print("(suspended closures left out; windows split at month boundaries, UTC)\n")
+    print(f"{'month':<10}{'road':<6}{'direction':<16}{'minutes':>10}{'closures':>10}")
+    for month, road, direction, minutes, closures in rows:
+        print(f"{month:<10}{road:<6}{direction or '':<16}{minutes:>10}{closures:>10}")
+
+def report_metrics(before, profile=False, metrics_file=None):
+    """Print and/or append the metrics accumulated since `before` (a metrics_snapshot())"""
+    if profile or metrics_file:
+        metrics = metrics_since(before)
+        if profile:
+            print_profile(metrics)
+        if metrics_file:
+            write_metrics_line(metrics_file, metrics)
+
+def run_daemon(publish=False, profile=False, metrics_file=None, archive=None, output_format='text', output=None):
+    """
+    Keep the process warm and re-poll on an adaptive schedule until interrupted
+    With publish=True the status is handed to the status API instead of printed;
+    output_format='ndjson' writes each poll as one status_model() line to output
+    (default sys.stdout), with that poll's 'events' and 'next_poll' seconds.
+    profile/metrics_file report each poll's metrics (see report_metrics) and
+    archive records each poll in that history archive.
+    """
+    output = output or sys.stdout
+    try:
+        while True:
+            before = metrics_snapshot()
+            if publish or output_format == 'ndjson':
+                weather, closures, closures_hash = fetch_all(closures_max_age=0, revalidate_in_background=False)
+                m4_status, m48_status = get_bridge_current_status(closures) if closures is not None else (None, None)
             else:
-                print(f"   ℹ️  Planned: {closure['description']}")
-                print(f"      {closure['reason']}")
-                if closure['start']:
-                    try:
-                        start_time = datetime.fromisoformat(closure['start'].replace('Z', '+00:00'))
-                        print(f"      From: {start_time.strftime('%Y-%m-%d %H:%M %Z')}")
-                    except:
-                        pass
-                if closure['end']:
-                    try:
-                        end_time = datetime.fromisoformat(closure['end'].replace('Z', '+00:00'))
-                        print(f"      Until: {end_time.strftime('%Y-%m-%d %H:%M %Z')}")
-                    except:
-                        pass
-    else:
-        print(f"   ✓ No closures or restrictions")
-    print()
-    
-    # M4 Status
-    status_symbol_4 = "🟢" if m4_status['status'] == "OPEN" else "🔴" if m4_status['status'] == "CLOSED" else "🟡"
-    print(f"{status_symbol_4} M4 PRINCE OF WALES BRIDGE (Second Severn Crossing, 1996)")
-    print(f"   Overall Status: {m4_status['status']}")
-    
-    # Directional Status
-    east_symbol = "🟢" if m4_status['eastbound'] == "OPEN" else "🔴" if m4_status['eastbound'] == "CLOSED" else "🟡"
-    west_symbol = "🟢" if m4_status['westbound'] == "OPEN" else "🔴" if m4_status['westbound'] == "CLOSED" else "🟡"
-    print(f"   → Eastbound (Wales → England): {east_symbol} {m4_status['eastbound']}")
-    print(f"   ← Westbound (England → Wales): {west_symbol} {m4_status['westbound']}")
-    if m4_status['closures']:
-        for closure in m4_status['closures']:
-            direction_str = ""
-            if 'direction' in closure:
-                direction = closure.get('direction', 'unknown').lower()
-                if direction == 'eastbound':
-                    direction_str = "→ Eastbound: "
-                elif direction == 'westbound':
-                    direction_str = "← Westbound: "
-                elif direction == 'bothdirections':
-                    direction_str = "↔️ Both directions: "
-            
-            if closure['is_active']:
-                print(f"   ⚠️  ACTIVE CLOSURE - {direction_str}{closure['location']}")
-                print(f"      {closure['description']}")
-                if closure['start']:
-                    try:
-                        start_time = datetime.fromisoformat(closure['start'].replace('Z', '+00:00'))
-                        print(f"      From: {start_time.strftime('%Y-%m-%d %H:%M %Z')}")
-                    except:
-                        pass
-                if closure['end']:
-                    try:
-                        end_time = datetime.fromisoformat(closure['end'].replace('Z', '+00:00'))
-                        print(f"      Until: {end_time.strftime('%Y-%m-%d %H:%M %Z')}")
-                    except:
-                        pass
-                print(f"      {closure['description']}")
-                print(f"      Reason: {closure['reason']}")
-                print(f"      Cause: {closure['cause']}")
-                if closure['end']:
-                    try:
-                        end_time = datetime.fromisoformat(closure['end'].replace('Z', '+00:00'))
-                        print(f"      Until: {end_time.strftime('%Y-%m-%d %H:%M %Z')}")
-                    except:
-                        pass
+                weather, closures, m4_status, m48_status, closures_hash = run_once(
+                    closures_max_age=0, revalidate_in_background=False)
+            events = []
+            if closures is None:
+                interval, reason = POLL_INTERVAL_NORMAL, "last fetch failed"
             else:
-                print(f"   ℹ️  Planned: {closure['description']}")
-                print(f"      {closure['reason']}")
-    else:
-        print(f"   ✓ No closures or restrictions")
+                events = detect_changes(closures, (m4_status, m48_status), weather)
+                for event in events:
+                    print(f"📣 {describe_event(event)}")
+                interval, reason = next_poll_interval(weather, closures, (m4_status, m48_status))
+                publish_status_file(m4_status, m48_status, weather, closures)
+                if publish:
+                    publish_snapshot(weather, m4_status, m48_status, interval)
+                if archive:
+                    archive_snapshot(archive, closures_hash, closures, weather)
+            if output_format == 'ndjson':
+                model = status_model(weather, closures, m4_status, m48_status)
+                model.update(events=[event_payload(event) for event in events], next_poll=interval)
+                output.write(render_json(model, 'ndjson'))
+                output.flush()
+            report_metrics(before, profile, metrics_file)
+            print(f"\n⏱️  Next poll in {interval}s ({reason})\n")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        close_subscribers()
+
+def display_corridors(closures, now=None):
+    """Compact status of every registered corridor, road by road and direction by direction"""
+    for name, corridor in CORRIDORS.items():
+        print(f"\n{corridor['name'].upper()}")
+        for status in get_corridor_status(closures, name, now).values():
+            symbol = "🟢" if status['status'] == "OPEN" else "🔴" if status['status'] == "CLOSED" else "🟡"
+            directions = ', '.join(f"{direction} {status[direction.lower()]}" for direction in corridor['directions'])
+            print(f"{symbol} {status['bridge']}: {status['status']} ({directions})")
+            for closure in status['closures']:
+                if closure['is_active']:
+                    print(f"   ⚠️  {closure['location']}: {closure['description']}")
+
+def run_corridors():
+    """Show every registered corridor's status from one download and parse of the national feed"""
+    print("=" * 70)
+    print(f"🛣️  MONITORED CORRIDORS ({len(CORRIDORS)})")
+    print("=" * 70)
     
-    # Show upcoming planned closures for Severn Bridge area
-    print()
+    closures = fetch_closures_stream()
+    if closures is None:
+        print("❌ Failed to fetch data")
+        return
+    display_corridors(closures)
+    print("=" * 70)
+
+def run_what_if(at):
+    """Show the bridges' status at a given time, e.g. a planned crossing, from the current closures feed"""
     print("=" * 70)
-    print("📅 UPCOMING PLANNED CLOSURES (Severn Bridge Area)")
+    print(f"🔮 SEVERN BRIDGES - STATUS AT {at.astimezone().strftime('%Y-%m-%d %H:%M')} (Local)")
     print("=" * 70)
     
-    upcoming = []
-    for closure in closures:
-        if check_severn_bridge(closure):
-            is_active, reason = is_currently_active(closure)
-            if not is_active and closure['status'].lower() == 'planned':
-                upcoming.append(closure)
+    closures = fetch_closures_stream()
+    if closures is None:
+        print("❌ Failed to fetch data")
+        return
+    print()
     
-    if upcoming:
-        for idx, closure in enumerate(upcoming, 1):
-            print(f"\n{idx}. {closure['road']} - {closure['location']}")
-            print(f"   {clean_description(closure['description'])}")
-            if closure['start']:
-                try:
-                    start_time = datetime.fromisoformat(closure['start'].replace('Z', '+00:00'))
-                    print(f"   Starts: {start_time.strftime('%Y-%m-%d %H:%M %Z')}")
-                except:
-                    print(f"   Starts: {closure['start']}")
-            if closure['end']:
-                try:
-                    end_time = datetime.fromisoformat(closure['end'].replace('Z', '+00:00'))
-                    print(f"   Ends: {end_time.strftime('%Y-%m-%d %H:%M %Z')}")
-                except:
-                    print(f"   Ends: {closure['end']}")
+    timeline = get_timeline(closures)
+    for status in get_bridge_current_status(closures, now=at)[::-1]:
+        symbol = "🟢" if status['status'] == "OPEN" else "🔴" if status['status'] == "CLOSED" else "🟡"
+        print(f"{symbol} {status['bridge']}: {status['status']} "
+              f"(→ Eastbound {status['eastbound']}, ← Westbound {status['westbound']})")
+    
+    active = timeline.active_at(at)
+    print()
+    if active:
+        print("Closures in effect at that time:")
+        for closure in active:
+            print(f"   • {closure.road} {closure.direction}: {closure.location}")
+            print(f"     {classify_closure(closure)['description']}")
+            print(f"     {closure.start_time.strftime('%Y-%m-%d %H:%M %Z')} → "
+                  f"{closure.end_time.strftime('%Y-%m-%d %H:%M %Z')}")
     else:
-        print("\n✓ No upcoming planned closures")
-    
-    print("\n" + "=" * 70)
-    print("ℹ️  NOTES:")
-    print("   • 'active' status = closure confirmed by operator")
-    print("   • 'planned' status = scheduled closure, may not have started yet")
-    print("   • Ad-hoc closures (e.g., high winds) appear with 'active' status")
-    print("   • Check 'cause' field for reason (e.g., poorEnvironment for weather)")
-    print("   • Weather data updates every 30 minutes")
+        print("✓ No scheduled closure windows cover that time")
+    
+    next_change = timeline.next_change(at)
+    if next_change:
+        when, changes = next_change
+        print(f"\nNext change: {when.astimezone().strftime('%Y-%m-%d %H:%M')} (Local)")
+        for kind, closure in changes:
+            print(f"   {'starts' if kind == 'start' else 'ends'}: {closure.road} {closure.direction} - {closure.location}")
+    if timeline.undated:
+        print(f"\nℹ️  {len(timeline.undated)} closure(s) without a complete time window are not included")
+
+def _recording_time(path):
+    """UTC time of a recorded file from a timestamp in its name (e.g. closures-20260115T0905Z.xml), else its mtime"""
+    match = _RECORDING_TIMESTAMP.search(os.path.basename(path))
+    if match:
+        year, month, day, hour, minute, second = (int(part or 0) for part in match.groups())
+        return datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+    return datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+
+def find_recordings(directory):
+    """
+    Pair each recorded closures feed (*.xml[.gz]) in a directory with the latest Open-Meteo
+    response (*.json[.gz]) recorded at or before it
+    Returns: [(time, closures path, weather path or None)] in time order
+    """
+    closures, weather = [], []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        base = name[:-3] if name.endswith('.gz') else name
+        if base.endswith('.xml'):
+            closures.append((_recording_time(path), path))
+        elif base.endswith('.json'):
+            weather.append((_recording_time(path), path))
+    closures.sort()
+    weather.sort()
+    weather_times = [when for when, _ in weather]
+    recordings = []
+    for when, path in closures:
+        i = bisect_right(weather_times, when) - 1
+        recordings.append((when, path, weather[i][1] if i >= 0 else None))
+    return recordings
+
+def _read_recording(path):
+    import gzip
+    with (gzip.open if path.endswith('.gz') else open)(path, 'rb') as f:
+        return f.read()
+
+def _recorded_weather(path):
+    """Recorded Open-Meteo response(s) as bridge -> response (a list is per point, in BRIDGES order)"""
+    data = json.loads(_read_recording(path))
+    if isinstance(data, list):
+        return dict(zip(BRIDGES, data))
+    return {road: data for road in BRIDGES}
+
+def _wind_at(weather_data, when):
+    """Gust (mph) forecast for the hour containing `when`, else the recorded current wind; None without data"""
+    if not weather_data:
+        return None
+    gusts = weather_data.get('hourly', {}).get('windgusts_10m')
+    if gusts:
+        i = bisect_right(_forecast_hours(weather_data), when) - 1
+        if 0 <= i < len(gusts) and gusts[i] is not None:
+            return gusts[i] * KMH_TO_MPH
+    wind_kmh = weather_data.get('current_weather', {}).get('windspeed')
+    return wind_kmh * KMH_TO_MPH if wind_kmh is not None else None
+
+def _replay_init(monitor_mph, high_risk_mph, rules, corridors, areas):
+    """Process pool initializer: the parent's thresholds, rules and corridor/area registries, and quiet workers"""
+    global CLASSIFICATION_RULES, _area_grid
+    set_wind_thresholds(monitor_mph, high_risk_mph)
+    CLASSIFICATION_RULES = rules
+    CORRIDORS.clear()
+    CORRIDORS.update(corridors)
+    MONITORED_AREAS.clear()
+    MONITORED_AREAS.update(areas)
+    _area_grid = None
+    _corridors_changed()
+    sys.stdout = open(os.devnull, 'w')
+
+@contextmanager
+def _replay_caches():
+    """Run with empty parse, timeline and corridor caches, putting the live ones back afterwards"""
+    situations, timeline, corridors = dict(_situations), dict(_timeline_cache), dict(_corridor_cache)
+    _situations.clear()
+    _timeline_cache.update(closures=None, timeline=None)
+    _corridor_cache.update(closures=None, corridors=None)
+    try:
+        yield
+    finally:
+        _situations.clear()
+        _situations.update(situations)
+        _timeline_cache.update(timeline)
+        _corridor_cache.update(corridors)
+
+def _skip_unchanged_situations(data):
+    """
+    Cut situations the fingerprint cache already holds (same id and version) down to empty
+    elements, so the parser reuses their closures without tokenising them
+    """
+    parts = []
+    last = 0
+    for match in _SITUATION_OPEN.finditer(data):
+        if match.start() < last:
+            continue
+        attributes = match.group(1)
+        situation_id = _SITUATION_ID.search(attributes)
+        version = _SITUATION_VERSION.search(attributes)
+        if not (situation_id and version) or data[match.end() - 2:match.end()] == b'/>':
+            continue
+        previous = _situations.get(situation_id.group(1).decode())
+        if previous is None or previous[0] != version.group(1).decode():
+            continue
+        end = data.find(b'</situation>', match.end())
+        if end < 0:
+            break
+        parts.append(data[last:match.start()])
+        parts.append(b'<situation ' + attributes + b'/>')
+        last = end + len(b'</situation>')
+    parts.append(data[last:])
+    return b''.join(parts)
+
+def replay_batch(recordings):
+    """
+    Run parse → classify → bridge status on consecutive recordings with the clock set to each one's time
+    Consecutive snapshots share most situations, so the parse fingerprint cache does most of the work.
+    Returns: [(time, bridge, wind mph, predicted risk, actual status, wind closure active)]
+    """
+    rows = []
+    weather_path, weather = None, {}
+    for when, closures_path, recorded_weather_path in recordings:
+        closures = parse_xml_stream([_skip_unchanged_situations(_read_recording(closures_path))])
+        if recorded_weather_path != weather_path:
+            weather_path = recorded_weather_path
+            weather = _recorded_weather(weather_path) if weather_path else {}
+        for road, status in zip(('M4', 'M48'), get_bridge_current_status(closures, now=when)):
+            mph = _wind_at(weather.get(road), when)
+            predicted = get_wind_risk_level(mph)[0].split(' - ')[0]
+            wind_closure = any(closure['is_active'] and closure['cause'] == 'poorEnvironment'
+                               for closure in status['closures'])
+            rows.append((when, road, mph, predicted, status['status'], wind_closure))
+    return rows
+
+def replay(directory, workers=None, batch_size=REPLAY_BATCH_SIZE):
+    """
+    Backtest the thresholds and rules over a directory of recordings (see find_recordings)
+    Runs of batch_size consecutive snapshots are spread over a pool of worker processes
+    (os.cpu_count() by default; 1 runs in this process). Returns rows as replay_batch(), in time order.
+    """
+    recordings = find_recordings(directory)
+    batches = [recordings[i:i + batch_size] for i in range(0, len(recordings), batch_size)]
+    if workers == 1 or len(batches) <= 1:
+        # The live caches are set aside, not reused or overwritten, as a worker process starts empty
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull), _replay_caches():
+            return [row for batch in batches for row in replay_batch(batch)]
+    
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=_replay_init,
+                             initargs=(WIND_MONITOR_MPH, WIND_HIGH_RISK_MPH, CLASSIFICATION_RULES,
+                                       CORRIDORS, MONITORED_AREAS)) as pool:
+        return [row for rows in pool.map(replay_batch, batches) for row in rows]
+
+def print_replay(rows):
+    """Predicted wind risk vs actual bridge status per bridge, with how well HIGH RISK called closures"""
+    levels = ('Safe', 'MONITOR', 'HIGH RISK', 'unknown')
+    statuses = ('OPEN', 'RESTRICTED', 'CLOSED')
+    for road in ('M48', 'M4'):
+        road_rows = [row for row in rows if row[1] == road]
+        if not road_rows:
+            continue
+        table = {(predicted, actual): 0 for predicted in levels for actual in statuses}
+        for _, _, _, predicted, actual, _ in road_rows:
+            table[predicted, actual] += 1
+        
+        print(f"\n{BRIDGES[road]['name']}: {len(road_rows)} snapshots")
+        print(f"   {'predicted ↓ / actual →':<24}" + ''.join(f"{actual:>12}" for actual in statuses))
+        for predicted in levels:
+            if any(table[predicted, actual] for actual in statuses):
+                print(f"   {predicted:<24}" + ''.join(f"{table[predicted, actual]:>12}" for actual in statuses))
+        
+        # HIGH RISK is the closure call: score it against actual closures, and against wind closures
+        called = sum(row[3] == 'HIGH RISK' for row in road_rows)
+        for label, actual in (("closed", lambda row: row[4] == 'CLOSED'),
+                              ("wind closure", lambda row: row[5])):
+            hits = sum(row[3] == 'HIGH RISK' and actual(row) for row in road_rows)
+            total = sum(map(actual, road_rows))
+            precision = f"{hits / called:.0%}" if called else "n/a"
+            recall = f"{hits / total:.0%}" if total else "n/a"
+            print(f"   HIGH RISK vs {label}: precision {precision} ({hits}/{called}), recall {recall} ({hits}/{total})")
+
+def write_replay_csv(path, rows):
+    import csv
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['time', 'bridge', 'wind_mph', 'predicted', 'actual', 'wind_closure'])
+        for when, road, mph, predicted, actual, wind_closure in rows:
+            writer.writerow([when.isoformat(), road, f"{mph:.1f}" if mph is not None else '',
+                             predicted, actual, int(wind_closure)])
+
+def run_replay(directory, workers=None, csv_path=None):
+    """Replay a directory of recordings and print the predicted vs actual table"""
+    print("=" * 70)
+    print(f"⏪ REPLAY - thresholds MONITOR {WIND_MONITOR_MPH} mph, HIGH RISK {WIND_HIGH_RISK_MPH} mph")
     print("=" * 70)
+    started = time.perf_counter()
+    rows = replay(directory, workers)
+    elapsed = time.perf_counter() - started
+    if not rows:
+        print(f"❌ No recorded closures (*.xml, *.xml.gz) in {directory}")
+        return
+    snapshots = len(rows) // 2
+    print(f"Replayed {snapshots} snapshots from {rows[0][0]:%Y-%m-%d %H:%M} to {rows[-1][0]:%Y-%m-%d %H:%M} UTC "
+          f"in {elapsed:.1f}s ({snapshots / elapsed:.0f}/s)")
+    print_replay(rows)
+    if csv_path:
+        write_replay_csv(csv_path, rows)
+        print(f"\nPer-snapshot rows written to {csv_path}")
+    print("=" * 70)
+
+def _parse_at(value):
+    """argparse type for --at: ISO date/time, local time unless it carries an offset"""
+    import argparse
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a date/time like '2026-10-20 22:00', got {value!r}")
+    return parsed.astimezone(timezone.utc)  # naive values are taken as local time
+
+def _parse_address(value):
+    """argparse type for [HOST:]PORT"""
+    import argparse
+    host, _, port = value.rpartition(':')
+    try:
+        return host or SERVE_DEFAULT_HOST, int(port)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected [HOST:]PORT, got {value!r}")
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Severn Bridges status from National Highways and Open-Meteo")
+    parser.add_argument('--api-key-file', metavar='FILE',
+                        help="read the National Highways API key from FILE "
+                             "(default: $BRIDGE_API_KEY, else $BRIDGE_API_KEY_FILE or api_primary_key.txt)")
+    parser.add_argument('--daemon', action='store_true',
+                        help="keep running and poll on an adaptive schedule (wind risk, closure windows)")
+    parser.add_argument('--serve', metavar='[HOST:]PORT', type=_parse_address,
+                        help="run as a daemon and serve the status as JSON on /status (implies --daemon)")
+    parser.add_argument('--at', metavar='"YYYY-MM-DD HH:MM"', type=_parse_at,
+                        help="what-if: show the status at this local time instead of now")
+    parser.add_argument('--forecast', action='store_true',
+                        help=f"predict wind restriction/closure windows over the next {FORECAST_DAYS} days "
+                             "alongside planned closures")
+    parser.add_argument('--notify', metavar='TARGET', action='append', default=[],
+                        help="with --daemon/--serve, push bridge status and high-wind changes to TARGET: "
+                             "http(s)://webhook, mailto:ADDRESS or unix:SOCKET_PATH (repeatable)")
+    parser.add_argument('--corridors', action='store_true',
+                        help="show the status of every monitored corridor (Severn, M5 Avonmouth, M6 Thelwall) "
+                             "from one feed download")
+    parser.add_argument('--replay', metavar='DIR',
+                        help="backtest: replay recorded closures XML / Open-Meteo JSON files in DIR (timestamped "
+                             "names, e.g. closures-20260115T0905Z.xml) and compare predicted with actual closures")
+    parser.add_argument('--workers', type=int, help="worker processes for --replay (default: one per CPU)")
+    parser.add_argument('--replay-csv', metavar='FILE', help="also write --replay's per-snapshot rows to FILE")
+    parser.add_argument('--monitor-mph', type=float,
+                        help=f"wind speed for MONITOR risk (default {WIND_MONITOR_MPH})")
+    parser.add_argument('--high-risk-mph', type=float,
+                        help=f"wind speed for HIGH RISK, i.e. a likely closure (default {WIND_HIGH_RISK_MPH})")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text',
+                        help="status output: the text report, one JSON document, or JSON lines (one per poll "
+                             "with --daemon/--serve); json/ndjson send progress messages to stderr")
+    parser.add_argument('--rules', metavar='FILE', default=RULES_FILE,
+                        help="JSON classification rules replacing the built-in ones (default: $BRIDGE_RULES_FILE)")
+    parser.add_argument('--profile', action='store_true',
+                        help="print a per-stage timing breakdown and cache/download counters after each run")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="append each run's stage timings and counters to FILE as JSON lines")
+    parser.add_argument('--archive', metavar='FILE', default=ARCHIVE_FILE,
+                        help="record each run's closures and weather in this SQLite history archive "
+                             "(default: $BRIDGE_ARCHIVE)")
+    parser.add_argument('--history', action='store_true',
+                        help="print closure minutes per month per bridge direction from --archive and exit")
+    args = parser.parse_args(argv)
+    if args.history and not args.archive:
+        parser.error("--history needs --archive FILE (or $BRIDGE_ARCHIVE)")
+    if args.format != 'text' and (args.history or args.replay or args.at or args.forecast or args.corridors):
+        parser.error("--format applies to the status run and --daemon/--serve")
+    if args.format == 'json' and (args.daemon or args.serve):
+        parser.error("--format json writes one document; use --format ndjson with --daemon/--serve")
+    if args.notify and not (args.daemon or args.serve):
+        parser.error("--notify needs --daemon or --serve (changes are detected between polls)")
+    for target in args.notify:
+        try:
+            add_subscriber(target)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    if args.monitor_mph is not None or args.high_risk_mph is not None:
+        set_wind_thresholds(args.monitor_mph, args.high_risk_mph)
+    if args.api_key_file:
+        set_api_key(path=args.api_key_file)
+    if args.rules:
+        load_classification_rules(args.rules)
+    
+    # With --format json/ndjson stdout carries only the JSON; progress messages go to stderr,
+    # including those of background refreshes, which finish inside the redirect
+    output = sys.stdout
+    with redirect_stdout(sys.stderr if args.format != 'text' else output):
+        before = metrics_snapshot()
+        if args.history:
+            print_history(args.archive)
+        elif args.replay:
+            run_replay(args.replay, args.workers, args.replay_csv)
+        elif args.at:
+            run_what_if(args.at)
+            report_metrics(before, args.profile, args.metrics)
+        elif args.forecast:
+            run_forecast()
+            report_metrics(before, args.profile, args.metrics)
+        elif args.corridors:
+            run_corridors()
+            report_metrics(before, args.profile, args.metrics)
+        elif args.serve:
+            server = start_status_server(*args.serve)
+            try:
+                run_daemon(publish=True, profile=args.profile, metrics_file=args.metrics, archive=args.archive,
+                           output_format=args.format, output=output)
+            finally:
+                server.shutdown()
+        elif args.daemon:
+            run_daemon(profile=args.profile, metrics_file=args.metrics, archive=args.archive,
+                       output_format=args.format, output=output)
+        else:
+            weather, closures, m4_status, m48_status, closures_hash = run_once(output_format=args.format,
+                                                                               output=output)
+            if closures is not None:
+                publish_status_file(m4_status, m48_status, weather, closures)
+            if args.archive and closures is not None:
+                archive_snapshot(args.archive, closures_hash, closures, weather)
+            report_metrics(before, args.profile, args.metrics)
+        if args.format != 'text':
+            wait_for_refreshes()
 
-if __name__ == "__main__":
+if _RUN_AS_SCRIPT:
     main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Severn Bridge Monitor - shared status snapshot
+Reads the fixed-layout status file that bridge_monitor.py publishes after every run and
+daemon poll, so prompts, status bars and cron checks get the bridges' status in
+microseconds: no network, no XML, and nothing heavier than struct and mmap to import.
+
+Layout (little-endian, LAYOUT_VERSION):
+    header       magic, layout version, bridge count, generation, updated, closures as of
+    per bridge   road, overall/eastbound/westbound status, wind/gust risk, wind/gust mph
+    next         the next planned closure: start, end, road, direction, location
+
+The generation counter is a seqlock: the writer makes it odd before changing the
+file and even again afterwards, each time with a single 8-byte store (see
+set_generation), and readers retry until they see the same non-zero even
+generation before, after and inside their copy.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+STATUS_FILE = os.environ.get('BRIDGE_STATUS_FILE', os.path.join(
+    os.environ.get('BRIDGE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'severn_bridge')),
+    'status.bin'))
+
+MAGIC = b'SVBS'
+LAYOUT_VERSION = 1
+HEADER = struct.Struct('<4sHHQdd')        # magic, layout version, bridges, generation, updated, closures as of
+GENERATION = struct.Struct('<Q')
+GENERATION_OFFSET = 8
+# The header around the generation, so a writer can fill it without touching the counter
+# (pack_into clears its target bytes before writing them)
+HEADER_PREFIX = struct.Struct('<4sHH')     # magic, layout version, bridges at offset 0
+HEADER_TIMES = struct.Struct('<dd')        # updated, closures as of
+HEADER_TIMES_OFFSET = GENERATION_OFFSET + GENERATION.size
+BRIDGE = struct.Struct('<8s5B3xff')        # road, overall, eastbound, westbound, wind risk, gust risk, mph x2
+NEXT_CLOSURE = struct.Struct('<dd8s16s96s')  # start, end, road, direction, location
+BRIDGE_SLOTS = 2                           # M48, M4
+FILE_SIZE = HEADER.size + BRIDGE_SLOTS * BRIDGE.size + NEXT_CLOSURE.size
+
+STATUSES = ('unknown', 'OPEN', 'RESTRICTED', 'CLOSED')
+RISKS = ('unknown', 'Safe', 'MONITOR', 'HIGH RISK')
+READ_ATTEMPTS = 1000  # a write takes microseconds; give up rather than spin forever on a dead writer
+
+
+def _text(value):
+    return value.rstrip(b'\0').decode('utf-8', 'replace')
+
+
+def _time(value):
+    return value if value else None
+
+
+def set_generation(buffer, generation):
+    """Store the generation counter with one aligned 8-byte write, so readers never see it half-written"""
+    counter = memoryview(buffer)[GENERATION_OFFSET:GENERATION_OFFSET + GENERATION.size].cast('Q')
+    try:
+        # A native store: convert so the bytes in the file are little-endian on any host
+        counter[0] = int.from_bytes(generation.to_bytes(GENERATION.size, 'little'), sys.byteorder)
+    finally:
+        counter.release()
+
+
+def unpack_status(buffer):
+    """Decode one consistent copy of the status file (see read_status)"""
+    magic, version, bridges, generation, updated, as_of = HEADER.unpack_from(buffer)
+    if magic != MAGIC or version != LAYOUT_VERSION:
+        return None
+    status = {'generation': generation, 'updated': _time(updated), 'closures_as_of': _time(as_of),
+              'bridges': {}, 'next_closure': None}
+    offset = HEADER.size
+    for _ in range(min(bridges, BRIDGE_SLOTS)):
+        road, overall, east, west, wind, gust, wind_mph, gust_mph = BRIDGE.unpack_from(buffer, offset)
+        status['bridges'][_text(road)] = {
+            'status': STATUSES[overall], 'eastbound': STATUSES[east], 'westbound': STATUSES[west],
+            'wind': RISKS[wind], 'gusts': RISKS[gust],
+            'wind_mph': round(wind_mph, 1) if wind else None, 'gust_mph': round(gust_mph, 1) if gust else None,
+        }
+        offset += BRIDGE.size
+    start, end, road, direction, location = NEXT_CLOSURE.unpack_from(buffer, HEADER.size + BRIDGE_SLOTS * BRIDGE.size)
+    if road.strip(b'\0'):
+        status['next_closure'] = {'start': _time(start), 'end': _time(end), 'road': _text(road),
+                                  'direction': _text(direction), 'location': _text(location)}
+    return status
+
+
+def read_status(path=None):
+    """
+    The latest published status, or None if there is none (yet) or it has another layout
+    Returns: dict with 'generation', 'updated' and 'closures_as_of' (epoch seconds),
+    'bridges' (road -> status, eastbound, westbound, wind, gusts, wind_mph, gust_mph)
+    and 'next_closure' (start, end, road, direction, location) or None
+    """
+    try:
+        fd = os.open(path or STATUS_FILE, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        if os.fstat(fd).st_size < FILE_SIZE:
+            return None
+        with mmap.mmap(fd, FILE_SIZE, access=mmap.ACCESS_READ) as view:
+            for _ in range(READ_ATTEMPTS):
+                before = GENERATION.unpack_from(view, GENERATION_OFFSET)[0]
+                if before and before % 2 == 0:
+                    copy = view[:FILE_SIZE]
+                    if (GENERATION.unpack_from(copy, GENERATION_OFFSET)[0] == before
+                            and GENERATION.unpack_from(view, GENERATION_OFFSET)[0] == before):
+                        return unpack_status(copy)
+                time.sleep(0)
+        return None
+    finally:
+        os.close(fd)
+
+
+def format_status(status):
+    """One short line, e.g. 'M48 OPEN (E OPEN, W OPEN) | M4 RESTRICTED (E OPEN, W RESTRICTED) | gusts MONITOR'"""
+    parts = [f"{road} {bridge['status']} (E {bridge['eastbound']}, W {bridge['westbound']})"
+             for road, bridge in status['bridges'].items()]
+    gusts = [bridge['gusts'] for bridge in status['bridges'].values() if bridge['gusts'] != 'unknown']
+    if gusts:
+        parts.append(f"gusts {max(gusts, key=RISKS.index)}")
+    return ' | '.join(parts)
+
+
+def main(argv=None):
+    """
+    bridge_status.py [--json] [--field ROAD.KEY] [--max-age SECONDS] [--file PATH]
+    Exit status: 0 ok, 1 no status published, 2 status older than --max-age
+    """
+    args = list(sys.argv[1:] if argv is None else argv)
+    options = {'--field': None, '--max-age': None, '--file': None}
+    as_json = False
+    while args:
+        arg = args.pop(0)
+        if arg == '--json':
+            as_json = True
+        elif arg in options and args:
+            options[arg] = args.pop(0)
+        else:
+            print(main.__doc__.strip(), file=sys.stderr)
+            return 0 if arg in ('-h', '--help') else 64
+
+    status = read_status(options['--file'])
+    if status is None:
+        print("no status published", file=sys.stderr)
+        return 1
+    if as_json:
+        import json
+        print(json.dumps(status))
+    elif options['--field']:
+        road, _, key = options['--field'].partition('.')
+        print(status['bridges'].get(road, {}).get(key or 'status', 'unknown'))
+    else:
+        print(format_status(status))
+    max_age = options['--max-age']
+    if max_age is not None and (status['updated'] or 0) < time.time() - float(max_age):
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())